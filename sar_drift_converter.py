@@ -39,6 +39,127 @@ Copyright notice
  DEALINGS IN THE SOFTWARE.
 """
 
+import functools
+
+
+# (key, JSON schema type, minimum, type exit code, range exit code) for
+# every config value. Every key is required and no others are allowed.
+_CONFIG_FIELDS = (
+    ("sar_drift_directory", "string", None, 2, None),
+    ("sar_drift_filename", "string", None, 2, None),
+    ("sar_geotiff_filename", "string", None, 2, None),
+    ("netcdf_cdl_file", "string", None, 2, None),
+    ("output_dir", "string", None, 2, None),
+    ("batch_process", "boolean", None, 4, None),
+    ("delimiter", "string", None, 2, None),
+    ("skip_rows_before_header", "integer", 0, 11, 12),
+    ("detect_outliers", "boolean", None, 13, None),
+    ("ignore_vector_threshold", "integer", 1, 14, 15),
+    ("use_geotiff", "boolean", None, 7, None),
+    ("create_region_plot", "boolean", None, 16, None),
+    ("vector_stride", "integer", 1, 17, 18),
+    ("inlier_vector_stride", "integer", 1, 19, 20),
+    ("quiver_scale_small_area", "number", None, 21, None),
+    ("quiver_scale_large_area", "number", None, 22, None),
+    ("precision", "integer", None, 23, None),
+    ("verbose", "boolean", None, 24, None)
+)
+
+# message for a value below its minimum, keyed like _CONFIG_FIELDS
+_RANGE_MESSAGES = {
+    "skip_rows_before_header": "`skip_header_rwos = {} ` cannot be negative.",
+    "ignore_vector_threshold":
+        "`ignore_vector_threshold = {} ` must be greater than 1.",
+    "vector_stride": "`vector_stride = {} ` must be greater than 1.",
+    "inlier_vector_stride":
+        "`inlier_vector_stride = {} ` must be greater than 1."
+}
+
+# config values that hold file or directory paths
+_PATH_FIELDS = (
+    "sar_drift_directory",
+    "sar_drift_filename",
+    "sar_geotiff_filename",
+    "netcdf_cdl_file",
+    "output_dir"
+)
+
+# integer config values and the name used in their error message.
+# JSON schema "integer" also accepts whole floats such as 2.0, so these
+# get an exact type check after schema validation
+_INT_FIELDS = (
+    ("skip_rows_before_header", "skip_header_rows"),
+    ("ignore_vector_threshold", "ignore_vector_threshold"),
+    ("vector_stride", "vector_stride"),
+    ("inlier_vector_stride", "inlier_vector_stride"),
+    ("precision", "precision")
+)
+
+_REQUIRED_JSON_KEYS = frozenset(key for key, *_ in _CONFIG_FIELDS)
+_CONFIG_EXIT_CODES = {key: rc for key, _, _, rc, _ in _CONFIG_FIELDS}
+_RANGE_EXIT_CODES = {
+    key: rc for key, _, _, _, rc in _CONFIG_FIELDS if rc is not None
+}
+
+# label and config key for each line of the verbose parameter printout
+_PRINT_ORDER = (
+    ("sar drift directory", "sar_drift_directory"),
+    ("sar drift file", "sar_drift_file"),
+    ("sar geotiff file", "sar_geotiff_file"),
+    ("NetCDF CDL file", "netcdf_cdl_file"),
+    ("output directory", "output_dir"),
+    ("batch process", "batch_process"),
+    ("delimiter", "delimiter"),
+    ("skip rows before header", "skip_rows_before_header"),
+    ("use geotiff image", "use_geotiff"),
+    ("detect outliers", "detect_outliers"),
+    ("ignore vector threshold", "ignore_vector_threshold"),
+    ("create region plot", "create_region_plot"),
+    ("vector stride", "vector_stride"),
+    ("inlier vector stride", "inlier_vector_stride"),
+    ("quiver scale small area", "quiver_scale_small_area"),
+    ("quiver scale large area", "quiver_scale_large_area"),
+    ("precision", "precision"),
+)
+
+_CONFIG_SCHEMA = {
+    "type": "object",
+    "properties": {
+        key: {"type": json_type} if minimum is None
+        else {"type": json_type, "minimum": minimum}
+        for key, json_type, minimum, _, _ in _CONFIG_FIELDS
+    },
+    "required": sorted(_REQUIRED_JSON_KEYS),
+    "additionalProperties": False
+}
+
+
+@functools.lru_cache(maxsize=None)
+def _get_config_validator():
+    """
+    Compile `_CONFIG_SCHEMA` once and reuse the validator on later calls.
+    """
+
+    import fastjsonschema
+
+    return fastjsonschema.compile(_CONFIG_SCHEMA)
+
+
+def _check_int_fields(config):
+    """
+    Exit if an integer config value arrived as any other type.
+    """
+
+    import util
+
+    for key, label in _INT_FIELDS:
+        if type(config[key]) is not int:
+            util.error_msg(
+                f'`{label}` must be an integer, '
+                f'got {type(config[key]).__name__}',
+                _CONFIG_EXIT_CODES[key]
+            )
+
 
 def read_json_config():
     """
@@ -96,7 +217,7 @@ def read_json_config():
         dict: A dictionary of JSON keys and their values
     
     Raises:
-        Exits the script (status code 1–19) if:
+        Exits the script (status code 1–24) if:
             - Config file is missing or improperly formatted.
             - Required files or directories do not exist.
             - Types for fields like `precision` or `verbose` are invalid.
@@ -110,6 +231,7 @@ def read_json_config():
     import argparse
     import os
     import json
+    import fastjsonschema
 
 
     # json config file
@@ -129,60 +251,68 @@ def read_json_config():
         util.error_msg('Missing or empty config file argument', 1)
         
     
-    config_file = os.path.normpath(os.path.join(args.config_file))
-    with open(config_file, 'r') as f:
-        config = json.load(f)
-    
-    # confirm the needed keys, and only those keys, exist
-    required_json_keys = {
-        "sar_drift_directory",
-        "sar_drift_filename",
-        "sar_geotiff_filename",
-        "netcdf_cdl_file",
-        "output_dir",
-        "batch_process",
-        "delimiter",
-        "skip_rows_before_header",
-        "detect_outliers",
-        "ignore_vector_threshold",
-        "use_geotiff",
-        "create_region_plot",
-        "vector_stride",
-        "inlier_vector_stride",
-        "quiver_scale_small_area",
-        "quiver_scale_large_area",
-        "precision",
-        "verbose"
-    }        
-    config_keys = set(config.keys())
-    if config_keys != required_json_keys:
-        missing = required_json_keys - config_keys
-        extra = config_keys - required_json_keys
+    config_file = os.path.normpath(args.config_file)
+    try:
+        with open(config_file, 'rb') as f:
+            config = json.loads(f.read())
+    except (OSError, ValueError) as e:
+        util.error_msg(f"Cannot read config file `{config_file}`: {e}", 1)
+    
+    # report every missing or unexpected key at once before checking
+    # types and ranges
+    if not isinstance(config, dict):
+        util.error_msg(f"Invalid config {config_file}: not a JSON object", 2)
+    diff = config.keys() ^ _REQUIRED_JSON_KEYS
+    if diff:
+        missing = _REQUIRED_JSON_KEYS - config.keys()
+        extra = config.keys() - _REQUIRED_JSON_KEYS
+        problems = []
         if missing:
-            util.error_msg(
-                f"Missing required keys in {config_file}: "
-                f"{', '.join(missing)}",
-                2
+            problems.append(
+                f"Config {config_file} is missing keys: "
+                f"{', '.join(sorted(missing))}"
             )
         if extra:
+            problems.append(
+                f"Config {config_file} has unexpected keys: "
+                f"{', '.join(sorted(extra))}"
+            )
+        # missing keys keep precedence for the exit code
+        util.error_msg("\n     ".join(problems), 2 if missing else 3)
+    
+    # confirm the values have valid types and ranges
+    try:
+        _get_config_validator()(config)
+    except fastjsonschema.JsonSchemaValueException as e:
+        # e.name is `data.<key>` for per-field errors
+        key = e.name.partition('.')[2]
+        if e.rule == 'additionalProperties':
+            util.error_msg(f"Invalid config {config_file}: {e.message}", 3)
+        if e.rule == 'minimum' and key in _RANGE_EXIT_CODES:
+            # a whole float below the minimum is a type error first
+            _check_int_fields(config)
             util.error_msg(
-                f"Unexpected keys in {config_file}: {', '.join(extra)}",
-                3
+                _RANGE_MESSAGES[key].format(config[key]),
+                _RANGE_EXIT_CODES[key]
             )
+        util.error_msg(
+            f"Invalid config {config_file}: {e.message}",
+            _CONFIG_EXIT_CODES.get(key, 2)
+        )
+    _check_int_fields(config)
 
+    # normalize every path value once
+    paths = {key: os.path.normpath(config[key]) for key in _PATH_FIELDS}
+    sar_drift_directory = paths['sar_drift_directory']
+    sar_drift_file = paths['sar_drift_filename']
+    sar_geotiff_file = paths['sar_geotiff_filename']
+    netcdf_cdl_file = paths['netcdf_cdl_file']
+    output_dir = paths['output_dir']
+    
+    
     # check sar drift directory exists
     batch_process = config['batch_process']
-    if not isinstance(batch_process, bool):
-        util.error_msg(
-            f'`batch_process` must be boolen, '
-            f'got {type(batch_process).__name__}',
-            4
-        )
-    batch_process = bool(batch_process)
-    sar_drift_directory = os.path.normpath(
-        os.path.join(config['sar_drift_directory'])
-    )
-    if not os.path.exists(sar_drift_directory) and batch_process:
+    if batch_process and not os.path.isdir(sar_drift_directory):
         util.error_msg(
             f"Cannot find sar_drift_directory `{sar_drift_directory}`",
             5
@@ -190,26 +320,13 @@ def read_json_config():
         
         
     # check sar drift file exists
-    sar_drift_file = os.path.normpath(
-        os.path.join(config['sar_drift_filename'])
-    )
-    if not os.path.exists(sar_drift_file) and not batch_process:
+    if not batch_process and not os.path.isfile(sar_drift_file):
         util.error_msg(f"Cannot find sar_drift_file `{sar_drift_file}`", 6)
         
 
     # check sar geotiff file exists
     use_geotiff = config['use_geotiff']
-    if not isinstance(use_geotiff, bool):
-        util.error_msg(
-            f'`use_geotiff` must be boolen, '
-            f'got {type(use_geotiff).__name__}',
-            7
-        )
-    use_geotiff = bool(use_geotiff)
-    sar_geotiff_file = os.path.normpath(
-        os.path.join(config['sar_geotiff_filename'])
-    )
-    if not os.path.exists(sar_geotiff_file) and use_geotiff:
+    if use_geotiff and not os.path.isfile(sar_geotiff_file):
         util.error_msg(
             f"Cannot find sar_getotiff_file `{sar_geotiff_file}`\n\t"
             f"---`use_geotiff` in {config_file} set to "
@@ -219,9 +336,6 @@ def read_json_config():
 
 
     # check netcdf cdl file exists
-    netcdf_cdl_file = os.path.normpath(
-        os.path.join(config['netcdf_cdl_file']
-    ))
     if not os.path.exists(netcdf_cdl_file):
         util.error_msg(
             f"Cannot find NetCDF CDL file `{netcdf_cdl_file}`",
@@ -230,151 +344,41 @@ def read_json_config():
         
         
     # check output dir exists
-    output_dir = os.path.normpath(os.path.join(config['output_dir']))
-    if not os.path.exists(output_dir):
+    if not os.path.isdir(output_dir):
         util.error_msg(
             f"Cannot find output directory `{output_dir}`",
             10
         )
     else:
-        # create subfolders
+        # create only the subfolders that are missing
+        with os.scandir(output_dir) as entries:
+            existing_dirs = {
+                entry.name for entry in entries if entry.is_dir()
+            }
+        for subdir in ('formatted_data', 'gpkg', 'nc', 'png'):
+            if subdir not in existing_dirs:
+                os.makedirs(os.path.join(output_dir, subdir), exist_ok=True)
         formatted_data_dir = os.path.join(output_dir, 'formatted_data')
-        os.makedirs(formatted_data_dir, exist_ok=True)
         gpkg_dir = os.path.join(output_dir, 'gpkg')
-        os.makedirs(gpkg_dir, exist_ok=True)
         nc_dir = os.path.join(output_dir, 'nc')
-        os.makedirs(nc_dir, exist_ok=True)
         png_dir = os.path.join(output_dir, 'png')
-        os.makedirs(png_dir, exist_ok=True)
 
 
     # delimiter character (encode().decode handles \t)
     delimiter = config['delimiter'].encode().decode('unicode_escape')
     
     
-    # header rows to skip
+    # remaining values were type and range checked by the schema
     skip_rows_before_header = config['skip_rows_before_header']
-    if not isinstance(skip_rows_before_header, int):
-        util.error_msg(
-            f'`skip_header_rows` must be an integer, '
-            f'got {type(skip_rows_before_header).__name__}',
-            11
-        )
-    skip_rows_before_header = int(skip_rows_before_header)
-    if skip_rows_before_header < 0:
-        util.error_msg(
-            f'`skip_header_rwos = {skip_rows_before_header} `'
-            ' cannot be negative.',
-            12
-        )
-    
-            
-    # detect outlier when process input files   
     detect_outliers = config['detect_outliers']
-    if not isinstance(detect_outliers, bool):
-        util.error_msg(
-            f'`detect_outliers` must be boolen, '
-            f'got {type(detect_outliers).__name__}',
-            13
-        )
-    detect_outliers = bool(detect_outliers)
-    
-
-    # ignore data files where vector observations are below the threshold
     ignore_vector_threshold = config['ignore_vector_threshold']
-    if not isinstance(ignore_vector_threshold, int):
-        util.error_msg(
-            f'`ignore_vector_threshold` must be an integer, '
-            f'got {type(ignore_vector_threshold).__name__}',
-            14
-        )
-    ignore_vector_threshold = int(ignore_vector_threshold)
-    if ignore_vector_threshold < 1:
-        util.error_msg(
-            f'`ignore_vector_threshold = {ignore_vector_threshold} `'
-            ' must be greater than 1.',
-            15
-        )
-        
-    # create subplots with region or just vectors on geotiff image
     create_region_plot = config['create_region_plot']
-    if not isinstance(create_region_plot, bool):
-        util.error_msg(
-            f'`create_region_plot` must be boolen, '
-            f'got {type(create_region_plot).__name__}',
-            16
-        )
-    create_region_plot = bool(create_region_plot)
-    
-    
-    # vector stride (offset count of records in SAR drift data)
     vector_stride = config['vector_stride']
-    if not isinstance(vector_stride, int):
-        util.error_msg(
-            f'`vector_stride` must be an integer, '
-            f'got {type(vector_stride).__name__}',
-            17
-        )
-    vector_stride = int(vector_stride)
-    if vector_stride < 1:
-        util.error_msg(
-            f'`vector_stride = {vector_stride} ` must be greater than 1.',
-            18
-        )
-
-
-    # inlier vector stride (offset count for vectors in all inliers plot)
     inlier_vector_stride = config['inlier_vector_stride']
-    if not isinstance(inlier_vector_stride, int):
-        util.error_msg(
-            f'`inlier_vector_stride` must be an integer, '
-            f'got {type(inlier_vector_stride).__name__}',
-            19
-        )
-    vector_stride = int(vector_stride)
-    if vector_stride < 1:
-        util.error_msg(
-            f'`vector_stride = {vector_stride} ` must be greater than 1.',
-            20
-        )
-        
-    # quiver scale (relational size of arrows in plot)
-    quiver_scale_small_area = config['quiver_scale_small_area']
-    if not isinstance(quiver_scale_small_area, float):
-        util.error_msg(
-            f'`quiver_scale_small_area` must be a float, '
-            f'got {type(quiver_scale_small_area).__name__}',
-            21
-        )
-        
-    quiver_scale_large_area = config['quiver_scale_large_area']
-    if not isinstance(quiver_scale_large_area, float):
-        util.error_msg(
-            f'`quiver_scale_large_area` must be a float, '
-            f'got {type(quiver_scale_large_area).__name__}',
-            22
-        )
-        
-
-
-    # precision to round significant digits
+    quiver_scale_small_area = float(config['quiver_scale_small_area'])
+    quiver_scale_large_area = float(config['quiver_scale_large_area'])
     precision = config['precision']
-    if not isinstance(precision, int):
-        util.error_msg(
-            f'`precision` must be an integer, got {type(precision).__name__}',
-            23
-        )
-    precision = int(precision)
-    
-    
-    # show arguments in console and processing messages
     verbose = config['verbose']
-    if not isinstance(verbose, bool):
-        util.error_msg(
-            f'`verbose` must be boolean, got {type(verbose).__name__}',
-            24
-        )
-    verbose = bool(verbose)       
     
     
     # initialize dictionary
@@ -404,50 +408,118 @@ def read_json_config():
     }
             
     # log settings
-    param_string = (
-        "CONF PARAMS:\n"
-        "  sar drift directory:     "
-        f"{config['sar_drift_directory']}\n"
-        "  sar drift file:          "
-        f"{config['sar_drift_file']}\n"
-        "  sar geotiff file:        "
-        f"{config['sar_geotiff_file']}\n"
-        "  NetCDF CDL file:         "
-        f"{config['netcdf_cdl_file']}\n"
-        "  output directory:        "
-        f"{config['output_dir']}\n"
-        "  batch process:           "
-        f"{config['batch_process']}\n"
-        "  delimiter:               "
-        f"`{config['delimiter']}`\n"
-        "  skip rows before header: "
-        f"{config['skip_rows_before_header']}\n"
-        "  use geotiff image:       "
-        f"{config['use_geotiff']}\n"
-        "  detect outliers:         "
-        f"{config['detect_outliers']}\n"
-        "  ignore vector threshold: "
-        f"{config['ignore_vector_threshold']}\n"        
-        "  create region plot:      "
-        f"{config['create_region_plot']}\n"
-        "  vector stride:           "
-        f"{config['vector_stride']}\n"
-        "  inlier vector stride:    "
-        f"{config['inlier_vector_stride']}\n"        
-        "  quiver scale small area: "
-        f"{config['quiver_scale_small_area']}\n"
-        "  quiver scale large area: "
-        f"{config['quiver_scale_large_area']}\n"        
-        "  precision:               "
-        f"{config['precision']}\n"
-    )
     if config['verbose'] is True:
-        print(param_string)
+        print("CONF PARAMS:\n" + "\n".join(
+            f"  {label + ':':<25}"
+            + (f"`{config[key]}`" if key == 'delimiter' else f"{config[key]}")
+            for label, key in _PRINT_ORDER
+        ) + "\n")
     
     
     return config        
 
 
+def process_data_file(data_file, config):
+    """
+    Convert one SAR drift data file into the formatted CSV, GeoPackage,
+    NetCDF and PNG outputs.
+
+    Parameters:
+        data_file (str): Path to the SAR drift data file.
+        config (dict): Parsed configuration from `read_json_config`.
+    """
+
+    import util
+    import os
+    import pandas as pd
+    
+    # set base name for output files
+    data_file_basename = os.path.splitext(
+        os.path.basename(data_file)
+    )[0]
+
+       
+    # Read SAR drift data file
+    df_sar = util.read_sar_drift_data_file(
+        input_file=data_file,
+        config=config
+    )
+
+    output_path = os.path.join(
+        config['formatted_data_dir'],
+        f"formatted_{data_file_basename}.csv"
+    )
+    df_sar.to_csv(output_path, index=False)
+    
+
+    """
+    Per OSI SAF, the dates in file names that have motion data
+    the dates in the file typically is the end date of the observation period
+    https://osisaf-hl.met.no/sites/osisaf-hl/files/user_manuals/
+    osisaf_pum_sea-ice-drift-lr_v1p9.pdf
+    (Page 25)
+    
+    Version `0` indicates first process wihtout cleaned data
+    
+    For multiple pairs in one period, have included start/end date/time
+    """
+    # reduce the numeric Julian seconds, then convert only the extremes
+    start_date = pd.to_datetime(
+        df_sar['Time1_JS'].min(), unit='s', origin=util.JS_EPOCH
+    ).strftime("%Y%m%d")
+
+    end_date = pd.to_datetime(
+        df_sar['Time2_JS'].max(), unit='s', origin=util.JS_EPOCH
+    ).strftime("%Y%m%d")
+
+
+    # Create shape file package for QGIS    
+    gdf_points, gdf_lines = util.create_shape_package(
+        df=df_sar,
+        base_name=data_file_basename,
+        config=config
+    )
+    
+    
+    # Create NetCDF file for QGIS    
+    util.create_netcdf(
+        df=df_sar,
+        base_name=data_file_basename,
+        config=config
+    )
+
+    # combine all created netcdf files into one
+    output_basename = (
+        f"SIVelocity_SAR_{start_date}_{end_date}_12km_NH_v00"
+    )
+    # util.concat_netcdf_files(config, output_basename)
+    
+    
+    # create individual PNG file
+    util.create_png(
+        config=config,
+        base_name=data_file_basename
+    )
+    return
+
+    # Overlay SAR drift data vectors on geotiff image
+    util.overlay_sar_drift_on_geotiff(
+        config=config,
+        gdf_lines=gdf_lines,
+        df_sar=df_sar,
+        base_name=data_file_basename
+    )
+    
+    return
+    
+    # Detect outliers
+    if config['detect_outliers']:
+        util.detect_outliers(
+            config=config,
+            outlier_type='sd'
+        )
+
+
 def main():
     """
     Main execution workflow for converting SAR drift data to GeoPackage
@@ -468,23 +540,28 @@ def main():
     # import sar_drift as sd
     import util
     import os
-    from glob import glob
+    from concurrent.futures import ProcessPoolExecutor
     from tqdm import tqdm
-    from datetime import datetime
     
     # parse user arguments
     config = read_json_config()
 
     files= []
     if config['batch_process']:
-        all_files = glob(os.path.join(config['sar_drift_directory'], '*'))
-        for file in all_files:
-            if ('.txt' in file) or ('.csv' in file):
-                files.append(file)
+        # gfilter files may carry a counter after the extension (.txt_0)
+        with os.scandir(config['sar_drift_directory']) as entries:
+            for entry in entries:
+                ext = os.path.splitext(entry.name)[1].split('_')[0].lower()
+                if ext in ('.txt', '.csv') and entry.is_file():
+                    files.append(entry.path)
     else:
         files = [config['sar_drift_file']]
         
     
+    # in batch mode the directory listing already says which 75km files
+    # exist, so only a single input file needs a filesystem probe
+    listed_files = set(files) if config['batch_process'] else None
+    
     updated_files = []
     for gfilter_path in files:
         
@@ -505,7 +582,12 @@ def main():
         )
         
         
-        if os.path.exists(gfilter_path_75km):
+        if listed_files is None:
+            has_75km = os.path.exists(gfilter_path_75km)
+        else:
+            has_75km = gfilter_path_75km in listed_files
+        
+        if has_75km:
             updated_files.append(gfilter_path_75km)
         else:
             # use original file name with counter after .txt_
@@ -527,94 +609,29 @@ def main():
         #             f"pct_correct={pct_correct:.1f}% (<60%)"
         #         )
     
-    for data_file in tqdm(updated_files, desc='Processing data files...'):
-        # set base name for output files
-        data_file_basename = os.path.splitext(
-            os.path.basename(data_file)
-        )[0]
-    
-           
-        # Read SAR drift data file
-        df_sar = util.read_sar_drift_data_file(
-            input_file=data_file,
-            config=config
-        )
-    
-        output_path = os.path.join(
-            config['formatted_data_dir'],
-            f"formatted_{data_file_basename}.csv"
-        )
-        df_sar.to_csv(output_path, index=False)
-        
-    
-        """
-        Per OSI SAF, the dates in file names that have motion data
-        the dates in the file typically is the end date of the observation period
-        https://osisaf-hl.met.no/sites/osisaf-hl/files/user_manuals/
-        osisaf_pum_sea-ice-drift-lr_v1p9.pdf
-        (Page 25)
-        
-        Version `0` indicates first process wihtout cleaned data
-        
-        For multiple pairs in one period, have included start/end date/time
-        """
-        start_min = df_sar['Date1'].min()
-        start_date = datetime.strptime(
-            start_min, "%Y-%m-%d %H:%M:%S"
-        ).strftime("%Y%m%d")
-
-        end_max = df_sar['Date2'].max()
-        end_date = datetime.strptime(
-            end_max, "%Y-%m-%d %H:%M:%S"
-        ).strftime("%Y%m%d")
-    
-    
-        # Create shape file package for QGIS    
-        gdf_points, gdf_lines = util.create_shape_package(
-            df=df_sar,
-            base_name=data_file_basename,
-            config=config
-        )
-        
-        
-        # Create NetCDF file for QGIS    
-        util.create_netcdf(
-            df=df_sar,
-            base_name=data_file_basename,
-            config=config
-        )
-
-        # combine all created netcdf files into one
-        output_basename = (
-            f"SIVelocity_SAR_{start_date}_{end_date}_12km_NH_v00"
-        )
-        # util.concat_netcdf_files(config, output_basename)
-        
-        
-        # create individual PNG file
-        util.create_png(
-            config=config,
-            base_name=data_file_basename
-        )
-        continue
-    
-        # Overlay SAR drift data vectors on geotiff image
-        util.overlay_sar_drift_on_geotiff(
-            config=config,
-            gdf_lines=gdf_lines,
-            df_sar=df_sar,
-            base_name=data_file_basename
-        )
-        
-        continue
-        
-        # Detect outliers
-        if config['detect_outliers']:
-            util.detect_outliers(
-                config=config,
-                outlier_type='sd'
-            )
-    
+    # build the NetCDF metadata template once up front so the worker
+    # processes read it instead of racing to run `ncgen`
+    util.prepare_netcdf_metadata(config)
+    
+    # every data file is independent, so spread them across processes.
+    # A single file runs in this process to skip the worker start-up,
+    # and no more workers are started than there are files
+    if len(updated_files) == 1:
+        process_data_file(updated_files[0], config)
+        return
+    
+    # (Windows caps a process pool at 61 workers; an empty batch still
+    # needs one so the empty progress loop runs as before)
+    max_workers = max(min(len(updated_files), os.cpu_count() or 1, 61), 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        list(tqdm(
+            executor.map(
+                functools.partial(process_data_file, config=config),
+                updated_files
+            ),
+            total=len(updated_files),
+            desc='Processing data files...'
+        ))
     
     
 if __name__ == "__main__":
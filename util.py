@@ -38,7 +38,9 @@ Copyright notice
 """
 
 import os
+import re
 import sys
+import functools
 from pathlib import Path
 
 # Derive paths from the active env rather than hard-coding
@@ -55,13 +57,21 @@ os.add_dll_directory(str(bin_dir))
 os.environ["PROJ_DATA"] = str(proj_dir)
 os.environ["PROJ_LIB"] = str(proj_dir)   # backward compatibility
 
-# Tell pyproj explicitly where proj.db lives
-from pyproj.datadir import set_data_dir
-set_data_dir(str(proj_dir))
+from typing import Tuple
 
-from pyproj import CRS, Transformer, Geod
+# numpy is used by most helpers; the geospatial libraries stay lazy
+import numpy as np
 
-from typing import Tuple
+# Julian seconds in SAR drift files count from this date
+JS_EPOCH = "2000-01-01"
+
+# pair timestamps in gfilter file names, e.g. 2024_10_15_02_13_41
+_DT_RE = re.compile(r"(\d{4}_\d{2}_\d{2}_\d{2}_\d{2}_\d{2})")
+
+# outlier category labels indexed by their base * 10 + confidence code
+_OUTLIER_CATEGORY_LABELS = np.array(
+    [f"{c:02d}" for c in range(32)], dtype=object
+)
 
 #=========================
 # Standard error messaging
@@ -94,11 +104,25 @@ def error_msg(msg, rc):
 # Internal functions
 #===================
 
+@functools.lru_cache(maxsize=1)
+def _configure_proj():
+    # Tell pyproj explicitly where proj.db lives. Deferred to first use
+    # so importing util does not pay for loading pyproj.
+    from pyproj.datadir import set_data_dir
+    set_data_dir(str(proj_dir))
+
+
+@functools.lru_cache(maxsize=1)
 def _set_transformer():
+    # built once per process; callers share the returned dict read-only
+    _configure_proj()
+    from pyproj import CRS, Transformer
+    
     transformer = {}
     
     # CRS setup
     transformer['epsg'] = 3413
+    transformer['crs_epsg_3413'] = CRS.from_epsg(transformer['epsg'])
     transformer['crs_string_3413'] = CRS.from_string(
         "+proj=stere +lat_0=90 +lat_ts=70 +lon_0=-45 "
         "+x_0=0 +y_0=0 +datum=WGS84 +units=m +no_defs +type=crs"
@@ -149,16 +173,20 @@ def _set_transformer():
 def _set_metadata(config):
     """
     Generate a NetCDF metadata template using a CDL file and load
-    it as an xarray.Dataset.
+    its global attributes.
     
     This function takes the user-defined CDL (Common Data Language)
     file path from the `user_args` dictionary, runs the `ncgen` 
     command-line tool to convert it into a NetCDF (.nc) file,
-    and then loads that file into memory using `xarray`.
+    and then reads its global attributes with `netCDF4`.
     
     The function is typically used to extract metadata
-    (attributes and structure) from a CDL file so that it can be applied
-    to a data-driven NetCDF file.
+    (global attributes) from a CDL file so that it can be applied
+    to a data-driven NetCDF file. Only the attributes are read; the
+    template's variables are never decoded.
+    
+    The template is cached on the CDL path and modification time, so
+    `ncgen` runs at most once per CDL edit rather than once per data file.
     
     Parameters:
         user_args (dict): Dictionary containing user-provided arguments,
@@ -167,20 +195,35 @@ def _set_metadata(config):
                                     is stored.
     
     Returns:
-        xarray.Dataset: A dataset containing only metadata
-                        from the generated NetCDF file.
+        dict: The global attributes of the generated NetCDF file.
     
     Raises:
         SystemExit: If the `ncgen` command fails or
                     returns a non-zero status code.
     """
 
+    
+    cdl_file = config['netcdf_cdl_file']
+    metadata_attrs = _load_cdl_metadata(
+        cdl_file, os.path.getmtime(cdl_file)
+    )
+    
+    # shallow copy so callers cannot alter the cached template
+    return dict(metadata_attrs)
 
-    import os
+
+@functools.lru_cache(maxsize=1)
+def _load_cdl_metadata(cdl_file, cdl_mtime):
+    """
+    Run `ncgen` on the CDL file, unless its .nc output is already newer
+    than the CDL, and return its global attributes.
+    `cdl_mtime` is only part of the cache key.
+    """
+    
+    
     import subprocess
-    import xarray as xr
+    import netCDF4
     
-    cdl_file = config['netcdf_cdl_file']
     cdl_file_dir = os.path.dirname(cdl_file)
     cdl_file_basename = os.path.basename(cdl_file)
     # Prepare ncgen input and output filenames
@@ -191,33 +234,41 @@ def _set_metadata(config):
         )
     
     
-    # Run ncgen command to generate the netCDF file from CDL
-    myCmd1 = " ".join(
-        [
+    if (not os.path.exists(ncgen_ofile_nc) or
+            os.path.getmtime(ncgen_ofile_nc) < cdl_mtime):
+        # Run ncgen command to generate the netCDF file from CDL.
+        # Exec it directly so no shell is spawned and paths with spaces
+        # need no quoting
+        myCmd1 = [
             "ncgen",
             "-o",
             ncgen_ofile_nc,
             cdl_file,
         ]
-    )
-        
-    rc = subprocess.call(myCmd1, shell=True)
-    if rc != 0:
-        error_msg(
-            'Error in `ncgen` call. Cannot continue.\n'
-            f'Command: {myCmd1}\nError Code: {rc}', 
-            25
-        )
+            
+        try:
+            rc = subprocess.call(myCmd1)
+        except OSError as e:
+            # without a shell a missing ncgen raises instead of
+            # returning 127
+            rc = e
+        if rc != 0:
+            error_msg(
+                'Error in `ncgen` call. Cannot continue.\n'
+                f'Command: {subprocess.list2cmdline(myCmd1)}\n'
+                f'Error Code: {rc}', 
+                25
+            )
         
-    return xr.open_dataset(ncgen_ofile_nc, decode_times=False)
+    # header-only read, no xarray decode of the template variables
+    with netCDF4.Dataset(ncgen_ofile_nc, mode='r') as src:
+        return {name: src.getncattr(name) for name in src.ncattrs()}
 
 
 def _parse_pair_times(name):
-    import re
     from datetime import datetime
     
-    DT_RE = re.compile(r"(\d{4}_\d{2}_\d{2}_\d{2}_\d{2}_\d{2})")
-    parts = DT_RE.findall(name)
+    parts = _DT_RE.findall(name)
     if len(parts) < 2:
         raise ValueError(f"Expected 2 timestamps, found {len(parts)} in: {name}")
     t1 = datetime.strptime(parts[0], "%Y_%m_%d_%H_%M_%S")
@@ -230,7 +281,6 @@ def _create_arctic_grid(nc_file_path, run_date, config):
     Creates a NaN-filled Arctic grid NetCDF in EPSG:3413 at resolution_km.
     Uses NASA EASE Grid 12.5
     """
-    import numpy as np
     import xarray as xr
     from datetime import datetime
     
@@ -284,11 +334,11 @@ def _create_arctic_grid(nc_file_path, run_date, config):
 
 
     # Set NetCDF standard attributes
-    metadata_nc = _set_metadata(config)
+    metadata_attrs = _set_metadata(config)
     
     
     # Replace placeholders with real values
-    ds.attrs.update(metadata_nc.attrs)
+    ds.attrs.update(metadata_attrs)
     ds.attrs['date_created'] = (
         datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
     )
@@ -351,16 +401,16 @@ def _create_netcdf_base_grid():
     The domain is defined by a regular x/y lattice that covers the entire range of
     longitudes and the latitude band >= lat_min. Cells below lat_min are masked.
     """
-    import numpy as np
     import xarray as xr
-    from pyproj import CRS, Transformer
 
-    # CRS
-    crs = CRS.from_epsg(3413)
+    # CRS (EPSG:3413 definition kept for the CF grid mapping attributes)
+    transformer = _set_transformer()
+    crs = transformer['crs_epsg_3413']
     step_m = 12_500
     
-    to_3413 = Transformer.from_crs("EPSG:4326", crs, always_xy=True)
-    to_ll = Transformer.from_crs(crs, "EPSG:4326", always_xy=True)
+    # reuse the process-wide cached transformers for the same projection
+    to_3413 = transformer['4326_to_3413']
+    to_ll = transformer['3413_to_4326']
 
     # ---- Build a conservative x/y bounding box that covers lon [-180,180] for lat>=lat_min ----
     # Sample the boundary at lat_min across all longitudes; take min/max projected x/y.
@@ -458,7 +508,6 @@ def _nearest_idx_1d(coord_1d, values):
     np.ndarray
 
     """
-    import numpy as np
     
     values = np.asarray(values)
     # If 'left', the index of the first suitable location found is given.
@@ -480,7 +529,6 @@ def _ensure_increasing_1d_coord(ds, dim):
     Ensure ds[dim] is monotonic increasing by flipping if needed.
     (Cheaper than sortby for regular grids.)
     """
-    import numpy as np
     
     if dim not in ds.dims:
         return ds
@@ -499,6 +547,39 @@ def _ensure_increasing_1d_coord(ds, dim):
         ds = ds.sortby(dim)
 
     return ds
+
+
+@functools.lru_cache(maxsize=2)
+def _get_polar_basemap(resolution="10m"):
+    """
+    Natural Earth land and coastline geometries projected once to the
+    polar stereographic map, so figures can reuse them with
+    `ax.add_geometries` instead of reloading and reprojecting.
+    
+    Returns:
+        tuple: (NorthPolarStereo CRS, land geometries, coastline geometries)
+    """
+    
+    import cartopy.crs as ccrs
+    import cartopy.feature as cfeature
+    
+    crs_3413 = ccrs.NorthPolarStereo(central_longitude=-45)
+    
+    def _project(feature):
+        geoms = []
+        for geom in feature.geometries():
+            # southern hemisphere shapes never appear on these maps
+            if geom.bounds[3] < 0:
+                continue
+            projected = crs_3413.project_geometry(geom, feature.crs)
+            if not projected.is_empty:
+                geoms.append(projected)
+        return tuple(geoms)
+    
+    land = cfeature.NaturalEarthFeature("physical", "land", resolution)
+    coast = cfeature.NaturalEarthFeature("physical", "coastline", resolution)
+    
+    return crs_3413, _project(land), _project(coast)
     
 
 #=========
@@ -537,8 +618,6 @@ def read_sar_drift_data_file(input_file, config):
             - total_distance_km: Great-circle distance in kilometers
     """
     import pandas as pd
-    import numpy as np
-    from datetime import datetime, timedelta
     
     # The project database for pyproj is properly set by the code above
     # Okay to ignore this warning and only this warning
@@ -553,41 +632,57 @@ def read_sar_drift_data_file(input_file, config):
     precision = config['precision']
     
     # Read the SAR drift data file
-    df = pd.read_csv(
-        input_file, delimiter=config['delimiter'],
-        header=0, engine='c', skiprows=config['skip_rows_before_header']
-    )
+    # with pyarrow's multi-threaded parser when it is installed and the
+    # delimiter is a single character (all pyarrow supports), otherwise
+    # with pandas. pyarrow is called directly because pandas' pyarrow
+    # engine ignores skiprows once a header row is given
+    delimiter = config['delimiter']
+    pa_csv = None
+    if len(delimiter) == 1:
+        try:
+            from pyarrow import csv as pa_csv
+        except ImportError:
+            pass
+    
+    if pa_csv is not None:
+        df = pa_csv.read_csv(
+            input_file,
+            read_options=pa_csv.ReadOptions(
+                skip_rows=config['skip_rows_before_header']
+            ),
+            parse_options=pa_csv.ParseOptions(delimiter=delimiter)
+        ).to_pandas()
+    else:
+        df = pd.read_csv(
+            input_file, delimiter=delimiter,
+            header=0, skiprows=config['skip_rows_before_header']
+        )
     df.columns = df.columns.str.strip()
     
     
-    # Add the appropriate input file to a data frame
-    # Julian seconds start from date 01-01-2000
-    base_time = datetime(2000, 1, 1)
-
     # Remove rows from Data Frame where orig_bearing = 0
     # The values for these observations are incorrect
-    df = df[df['Bear_deg'] != 0]
+    # Done straight after parsing, with a plain NumPy mask, so every
+    # derived column below is only computed for the kept rows
+    df = df[df['Bear_deg'].to_numpy() != 0]
 
     # Create new Date* columnc by converting Time_JS* columns to datetime
-    df['Date1'] = df["Time1_JS"].apply(
-        lambda x: base_time + timedelta(seconds=x)
-        )
-    df['Date1'] = df['Date1'].dt.strftime('%Y-%m-%d %H:%M:%S')
-    df['Date2'] = df["Time2_JS"].apply(
-        lambda x: base_time + timedelta(seconds=x)
-        )
-    df['Date2'] = df['Date2'].dt.strftime('%Y-%m-%d %H:%M:%S')
+    # Julian seconds start from date 01-01-2000
+    df['Date1'] = pd.to_datetime(
+        df['Time1_JS'].to_numpy(), unit='s', origin=JS_EPOCH
+        ).strftime('%Y-%m-%d %H:%M:%S')
+    df['Date2'] = pd.to_datetime(
+        df['Time2_JS'].to_numpy(), unit='s', origin=JS_EPOCH
+        ).strftime('%Y-%m-%d %H:%M:%S')
 
 
     # Calculate duration of observations
-    # 1. Date time
+    # 1. Date time, kept as timedelta64 (to_csv writes the same
+    #    "0 days 12:00:00" text; the GeoPackage writer stringifies it)
     # 2. Raw Julian seconds
-    df['Duration'] = pd.to_timedelta(
-        df['Time2_JS'] - df['Time1_JS'], unit='s'
-        ).astype(str)
-    df['JS_Duration'] = (
-        df['Time2_JS'] - df['Time1_JS']
-        )
+    js_duration = df['Time2_JS'] - df['Time1_JS']
+    df['Duration'] = pd.to_timedelta(js_duration.to_numpy(), unit='s')
+    df['JS_Duration'] = js_duration
 
 
     # Convert lon/lat to float and round
@@ -598,14 +693,19 @@ def read_sar_drift_data_file(input_file, config):
     
 
     # transform lon/lat to polarstereographic meters
+    # in one call over the start and end points stacked together
     transformer = _set_transformer()
     
-    df['X1'], df['Y1'] = transformer['4326_to_3413'].transform(
-        df['Lon1'].values, df['Lat1'].values
+    n = len(df)
+    lon = np.concatenate(
+        [df['Lon1'].to_numpy(np.float64), df['Lon2'].to_numpy(np.float64)]
     )
-    df['X2'], df['Y2'] = transformer['4326_to_3413'].transform(
-        df['Lon2'].values, df['Lat2'].values
+    lat = np.concatenate(
+        [df['Lat1'].to_numpy(np.float64), df['Lat2'].to_numpy(np.float64)]
     )
+    x, y = transformer['4326_to_3413'].transform(lon, lat)
+    df['X1'], df['Y1'] = x[:n], y[:n]
+    df['X2'], df['Y2'] = x[n:], y[n:]
     
     
     # Get the zonal and meridional displacment used by NetCDF
@@ -614,17 +714,18 @@ def read_sar_drift_data_file(input_file, config):
     
 
     # set dX and dY to plot quivers
-    df['dx'] = df['X2'] - df['X1']
-    df['dy'] = df['Y2'] - df['Y1']
-    df['total_distance_km'] = compute_distance_meters(
-        df['X1'].values, df['Y1'].values,
-        df['X2'].values, df['Y2'].values,
-        precision
-    )
+    # from the projected arrays, which also give the drift distance
+    dx = x[n:] - x[:n]
+    dy = y[n:] - y[:n]
+    df['dx'] = dx
+    df['dy'] = dy
+    # Distance in kilometers --> np.hypot=(dx^2+dy^2)^.5
+    df['total_distance_km'] = np.round(np.hypot(dx, dy) / 1000, precision)
     
     
-    df['Sat1'] = df["File1"].str.partition("_")[0]
-    df['Sat2'] = df["File2"].str.partition("_")[0]
+    # satellite name is the file name prefix before the first underscore
+    df['Sat1'] = df["File1"].str.split("_", n=1).str[0]
+    df['Sat2'] = df["File2"].str.split("_", n=1).str[0]
     
 
     
@@ -637,8 +738,9 @@ def create_shape_package(df, base_name, config):
     derived from SAR drift data, suitable for visualization in GIS software.
 
     This function processes a SAR drift DataFrame and performs the following:
-        - Transforms geographic coordinates (lon/lat) to Polar Stereographic
-          (EPSG:3413)
+        - Reuses the projected X1/Y1/X2/Y2 columns, transforming
+          geographic coordinates (lon/lat) to Polar Stereographic
+          (EPSG:3413) only when they are missing
         - Creates start and end point geometries for each drift vector
         - Creates line geometries connecting start and end points
         - Saves all geometries into a single multi-layer GeoPackage file with
@@ -689,100 +791,85 @@ def create_shape_package(df, base_name, config):
     import os
     import pandas as pd
     import geopandas as gpd
-    from shapely.geometry import Point, LineString
+    import shapely
     
-    # reduce data frame to needed features
-    df_local = df.copy()
     transformer = _set_transformer()
     
-    # transform projection
-    df_local['X1'], df_local['Y1'] = transformer['4326_to_3413'].transform(
-        df_local['Lon1'].values, df_local['Lat1'].values
-    )
-    df_local['X2'], df_local['Y2'] = transformer['4326_to_3413'].transform(
-        df_local['Lon2'].values, df_local['Lat2'].values
-    )
+    # `read_sar_drift_data_file` already projected the coordinates; only
+    # transform input that arrives without them. The caller's data frame
+    # is never copied or modified
+    if 'X1' in df:
+        x1, y1 = df['X1'].to_numpy(), df['Y1'].to_numpy()
+        x2, y2 = df['X2'].to_numpy(), df['Y2'].to_numpy()
+    else:
+        x1, y1 = transformer['4326_to_3413'].transform(
+            df['Lon1'].values, df['Lat1'].values
+        )
+        x2, y2 = transformer['4326_to_3413'].transform(
+            df['Lon2'].values, df['Lat2'].values
+        )
 
-    # Create Point and Line Geometries
-    df_local['geometry_start'] = df_local.apply(
-        lambda row: Point((row['X1'], row['Y1'])), axis=1
-    )
-    
-    df_local['geometry_end'] = df_local.apply(
-        lambda row: Point((row['X2'], row['Y2'])), axis=1
-    )
-    df_local['geometry_line'] = df_local.apply(
-        lambda row: LineString(
-            [(row['X1'], row['Y1']), (row['X2'], row['Y2'])]
-        ),
-        axis=1
-    )
+    # Create Point and Line Geometries from whole coordinate arrays
+    start_xy = np.column_stack([x1, y1])
+    end_xy = np.column_stack([x2, y2])
+    geometry_start = shapely.points(start_xy)
+    geometry_end = shapely.points(end_xy)
+    # (N, 2, 2): one start/end vertex pair per line
+    geometry_line = shapely.linestrings(np.stack([start_xy, end_xy], axis=1))
 
-    # Create GeoDataFrame for start points (points only)
-    gdf_start = gpd.GeoDataFrame(
-        df_local, geometry='geometry_start'
-    )
-    # Add a column to distinguish geometry type    
-    gdf_start['geometry_type'] = 'point'  
-    
-    # Create GeoDataFrame for end points (points only)
-    gdf_end = gpd.GeoDataFrame(
-        df_local, geometry='geometry_end'
-    )
-    # Add a column to distinguish geometry type    
-    gdf_end['geometry_type'] = 'point'  
+    # set the CRS once at construction instead of before every write
+    crs = transformer['crs_epsg_3413']
     
-    # Create GeoDataFrame for lines (lines only)
-    gdf_line = gpd.GeoDataFrame(
-        df_local, geometry='geometry_line'
-    )
-    # Add a column to distinguish geometry type    
-    gdf_line['geometry_type'] = 'line'  
-    
-    # Combine the two GeoDataFrames while retaining original fields
-    gdf_combined = pd.concat([
-        gdf_start.rename(columns={'geometry_start': 'geometry'}),
-        gdf_end.rename(columns={'geometry_end': 'geometry'}),
-        gdf_line.rename(columns={'geometry_line': 'geometry'})
-    ], ignore_index=True)
-    
-    # Recreate the GeoDataFrame with the common geometry column
-    gdf_combined = gpd.GeoDataFrame(
-        gdf_combined, geometry='geometry'
-    )
+    # One GeoDataFrame for all three layers; only its active geometry
+    # and the column that distinguishes the geometry type are swapped
+    # between writes
+    gdf = gpd.GeoDataFrame(df, geometry=geometry_start, crs=crs)
     
-    # Save as a single GeoPackage file (supports mixed geometries)
+    # Save as a single GeoPackage file with one layer per geometry
     geopackage_file = f"{base_name}.gpkg"
     output_file_path = os.path.join(
         config['gpkg_dir'], f"{geopackage_file}"
     )
     
-    gdf_start = gdf_start.rename(
-        columns={'geometry_start': 'geometry'}
-    ).set_geometry('geometry')
-    gdf_start.crs = CRS.from_epsg(transformer['epsg'])
-    gdf_start.to_file(output_file_path, layer='start_points', driver='GPKG')
-    
-    gdf_end = gdf_end.rename(
-        columns={'geometry_end': 'geometry'}
-    ).set_geometry('geometry')
-    gdf_end.crs = CRS.from_epsg(transformer['epsg'])
-    gdf_end.to_file(output_file_path, layer='end_points', driver='GPKG')
-    
-    
-    gdf_line = gdf_line.rename(
-        columns={'geometry_line': 'geometry'}
-    ).set_geometry('geometry')
-    gdf_line.crs = CRS.from_epsg(transformer['epsg'])
-    gdf_line.to_file(output_file_path, layer='drift_lines', driver='GPKG')
+    # GeoPackage has no interval type, so write Duration as text
+    if 'Duration' in df and pd.api.types.is_timedelta64_dtype(df['Duration']):
+        gdf['Duration'] = df['Duration'].astype(str)
+    
+    for layer, geometry, geometry_type in (
+            ('start_points', geometry_start, 'point'),
+            ('end_points', geometry_end, 'point'),
+            ('drift_lines', geometry_line, 'line')):
+        gdf.set_geometry(geometry, inplace=True, crs=crs)
+        # Add a column to distinguish geometry type
+        gdf['geometry_type'] = geometry_type
+        gdf.to_file(
+            output_file_path, layer=layer, driver='GPKG', engine='pyogrio'
+        )
     
-    gdf_start = gdf_start['geometry']
-    gdf_line = gdf_line['geometry']
+    gdf_start = gpd.GeoSeries(
+        geometry_start, index=df.index, crs=crs, name='geometry'
+    )
+    gdf_line = gpd.GeoSeries(
+        geometry_line, index=df.index, crs=crs, name='geometry'
+    )
 
     
     return gdf_start, gdf_line
 
 
+def prepare_netcdf_metadata(config):
+    """
+    Build the NetCDF metadata template from the configured CDL file ahead
+    of time, so worker processes reuse the generated `.nc` template
+    instead of each running `ncgen` on first use.
+    
+    Parameters:
+        config (dict): Parsed configuration with the 'netcdf_cdl_file' path.
+    """
+    
+    _set_metadata(config)
+
+
 def create_netcdf(df, base_name, config):
     """
     Generate a CF/ACDD-compliant NetCDF file from SAR drift data.
@@ -800,9 +887,10 @@ def create_netcdf(df, base_name, config):
           time coordinate (seconds since Unix epoch)
         - Loads metadata from a CDL file and populates standard global 
           attributes in the NetCDF file
-        - Maps each drift observation to the nearest grid cell, 
+        - Maps each drift observation to the nearest grid cell,
           skipping duplicates with a warning
-        - Writes the result to a compressed `.nc` file (NetCDF4 format)
+        - Writes the result to a chunked, compressed `.nc` file
+          (NetCDF4 format)
 
     Parameters:
         config (dict): Dictionary containing script arguments, including:
@@ -840,14 +928,13 @@ def create_netcdf(df, base_name, config):
           resolution
         - Metadata placeholders in the CDL template (e.g., `FILL_DATE_CREATED`)
           are replaced with actual values at runtime
-        - Observations mapped to the same grid cell will emit a warning
-          and be skipped
+        - Observations mapped to an already filled grid cell are skipped
+          and counted in a single warning
         - The resulting NetCDF is compatible with QGIS and other
           CF-compliant tools
     """
 
     import os
-    import numpy as np
     import pandas as pd
     from datetime import datetime
     import xarray as xr
@@ -856,20 +943,20 @@ def create_netcdf(df, base_name, config):
     resolution_km = 12.5  # Resolution in km
     
     
-    # reduce data frame to needed features   
-    df_copy = df.copy()
-    df_copy['Date1'] = pd.to_datetime(df_copy['Date1'])
-    df_copy['Date2'] = pd.to_datetime(df_copy['Date2'])
+    # parse the observation times into locals instead of copying
+    # the data frame
+    date1 = pd.to_datetime(df['Date1'])
+    date2 = pd.to_datetime(df['Date2'])
     
     
     # Get the absolute minimum and maximum for lat (Y) and lon (X)
     min_x, max_x = (
-        df_copy[['X1', 'X2']].min().min(),
-        df_copy[['X1', 'X2']].max().max()
+        df[['X1', 'X2']].min().min(),
+        df[['X1', 'X2']].max().max()
     )
     min_y, max_y = (
-        df_copy[['Y1', 'Y2']].min().min(),
-        df_copy[['Y1', 'Y2']].max().max()
+        df[['Y1', 'Y2']].min().min(),
+        df[['Y1', 'Y2']].max().max()
     )
     
     
@@ -886,9 +973,9 @@ def create_netcdf(df, base_name, config):
         
         # time defaults
         epoch = datetime(1970, 1, 1)
-        mean_time = pd.concat([df_copy['Date1'], df_copy['Date2']]).mean()
-        min_time = df_copy['Date1'].min()
-        max_time = df_copy['Date2'].max()
+        mean_time = pd.concat([date1, date2]).mean()
+        min_time = date1.min()
+        max_time = date2.max()
         
         # convert to "seconds since 1970-01-01 00:00:00"
         time_sec = (mean_time - epoch).total_seconds()
@@ -897,11 +984,43 @@ def create_netcdf(df, base_name, config):
         time_array = np.array([time_sec], dtype='float64')
         
         
-        # shell of NetCDF
+        # Mapping data to the grid
+        # The grid is uniform, so the nearest cell index is the rounded
+        # offset from the first coordinate in units of the resolution
+        res_m = resolution_km * 1000
+        x_idx = np.clip(
+            np.rint((df['X1'].to_numpy() - min_x) / res_m),
+            0, len(x_coords) - 1
+        ).astype(np.intp)
+        y_idx = np.clip(
+            np.rint((df['Y1'].to_numpy() - min_y) / res_m),
+            0, len(y_coords) - 1
+        ).astype(np.intp)
+        
+        # Keep the first observation in each grid cell and report how
+        # many later ones were skipped
+        cell_key = y_idx.astype(np.int64) * len(x_coords) + x_idx
+        keep = ~pd.Series(cell_key).duplicated(keep='first').to_numpy()
+        n_duplicates = keep.size - np.count_nonzero(keep)
+        if n_duplicates:
+            print(
+                f"{base_name}: {n_duplicates} duplicate grid cell(s) skipped"
+            )
+        y_idx = y_idx[keep]
+        x_idx = x_idx[keep]
+        
+        # Store data in the grid with one scatter per variable
+        grid_data = {}
+        for var in ('Speed_kmdy', 'dx', 'dy', 'Bear_deg'):
+            grid_data[var] = np.full(grid_shape, np.nan, dtype=np.float32)
+            grid_data[var][0, y_idx, x_idx] = df[var].to_numpy()[keep]
+        
+        
+        # NetCDF from the filled grids
         netcdf_grid = xr.Dataset(
             {
                 'Speed_kmdy': (('time', 'y', 'x'),
-                                np.full(grid_shape, np.nan),
+                                grid_data['Speed_kmdy'],
                                 {
                                     'long_name': "Speed in km/day",
                             		'standard_name': "sea_ice_speed",
@@ -913,7 +1032,7 @@ def create_netcdf(df, base_name, config):
                                     }
                                 ),
                 'dx': (('time', 'y', 'x'),
-                              np.full(grid_shape, np.nan),
+                              grid_data['dx'],
                               {
                                   'long_name': 'Zonal Velocity',
                                   'standard_name': 'movement_in_x_direction',
@@ -923,7 +1042,7 @@ def create_netcdf(df, base_name, config):
                                   }
                               ),
                 'dy': (('time', 'y', 'x'),
-                              np.full(grid_shape, np.nan),
+                              grid_data['dy'],
                               {
                                   'long_name': 'Meridional Velocity',
                                   'standard_name': 'movement_in_y_direction',
@@ -933,7 +1052,7 @@ def create_netcdf(df, base_name, config):
                                   }
                               ),
                 'Bear_deg': (('time', 'y', 'x'),
-                              np.full(grid_shape, np.nan),
+                              grid_data['Bear_deg'],
                               {
                                   'long_name': 'Bearing',
                                   'standard_name': "direction_true_north",
@@ -995,11 +1114,11 @@ def create_netcdf(df, base_name, config):
         
         
         # Set NetCDF standard attributes
-        metadata_nc = _set_metadata(config)
+        metadata_attrs = _set_metadata(config)
         
         
         # Replace placeholders with real values
-        netcdf_grid.attrs.update(metadata_nc.attrs)
+        netcdf_grid.attrs.update(metadata_attrs)
         netcdf_grid.attrs['date_created'] = (
             datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ')
             )
@@ -1038,41 +1157,26 @@ def create_netcdf(df, base_name, config):
         )
         
         
-        # Mapping data to the grid
-        index_mapping = {}
-        for _, row in df_copy.iterrows():
-            # To get the i, j indices, we
-            x_idx = np.argmin(np.abs(x_coords - row['X1']))
-            y_idx = np.argmin(np.abs(y_coords - row['Y1']))
-                
-            
-            # Create a unique key for each (i, j) pair
-            index_key = (y_idx, x_idx)
-            
-            # Check if this index already exists
-            if index_key in index_mapping:
-                print(f"Duplicate index detected at (i, j): {index_key}")
-            else:
-                # Store data in the grid
-                netcdf_grid['Speed_kmdy'][0, y_idx, x_idx] = row['Speed_kmdy']
-                netcdf_grid['dx'][0, y_idx, x_idx] = row['dx']
-                netcdf_grid['dy'][0, y_idx, x_idx] = row['dy']
-                netcdf_grid['Bear_deg'][0, y_idx, x_idx] = row['Bear_deg']
-
-        
-        # Save to NetCDF with compression level 4
+        # Save to NetCDF with chunked, shuffled, light deflate; the grid
+        # is mostly NaN so level 1 compresses nearly as well as level 4
         output_file_path = os.path.join(
             config['nc_dir'], f"{base_name}.nc"
         )
-        netcdf_grid.to_netcdf(
-            output_file_path, mode='w',
-            encoding={
-                'Speed_kmdy': {'zlib': True, 'complevel': 4},
-                'dx': {'zlib': True, 'complevel': 4},
-                'dy': {'zlib': True, 'complevel': 4},
-                'Bear_deg': {'zlib': True, 'complevel': 4},
-                'spatial_ref': {'dtype': 'int32'}
+        chunksizes = (1, min(256, len(y_coords)), min(256, len(x_coords)))
+        encoding = {
+            var: {
+                'zlib': True,
+                'complevel': 1,
+                'shuffle': True,
+                'chunksizes': chunksizes,
+                'dtype': 'float32'
             }
+            for var in ('Speed_kmdy', 'dx', 'dy', 'Bear_deg')
+        }
+        encoding['spatial_ref'] = {'dtype': 'int32'}
+        netcdf_grid.to_netcdf(
+            output_file_path, mode='w', engine='netcdf4',
+            encoding=encoding
         )
     
         
@@ -1085,7 +1189,6 @@ def create_netcdf(df, base_name, config):
 
 def create_png(config, base_name):
     import xarray as xr
-    import numpy as np
     import matplotlib.pyplot as plt
     import matplotlib.colors as mcolors
     import cartopy.crs as ccrs
@@ -1167,7 +1270,11 @@ def create_png(config, base_name):
     png_file = os.path.join(
         config['png_dir'], f"{base_name}.png"
     )
-    fig.savefig(png_file, bbox_inches='tight', dpi=300)
+    # fast zlib level: the PNG encode dominates the save at 300 dpi
+    fig.savefig(
+        png_file, bbox_inches='tight', dpi=300,
+        pil_kwargs={'compress_level': 1}
+    )
     plt.close(fig)
     
     
@@ -1176,7 +1283,6 @@ def concat_netcdf_files(config, output_basename):
     from collections import defaultdict
     import pandas as pd
     import xarray as xr
-    import numpy as np
     
     files = sorted(glob(r"output/nc/*.nc"))
     keep_vars = ["Speed_kmdy", "dx", "dy", "Bear_deg", "spatial_ref"]
@@ -1262,9 +1368,9 @@ def overlay_sar_drift_on_geotiff(config, gdf_lines, df_sar, base_name):
     
     
     import os
-    import numpy as np
     import matplotlib.pyplot as plt
-    from shapely.geometry import LineString, Polygon
+    import shapely
+    from shapely.geometry import Polygon
     import cartopy.crs as ccrs
     import cartopy.feature as cfeature
     from mpl_toolkits.axes_grid1.inset_locator import inset_axes
@@ -1317,13 +1423,15 @@ def overlay_sar_drift_on_geotiff(config, gdf_lines, df_sar, base_name):
             (xmin, ymin)  # close the loop
         ]
         
-        # transform 3413 to 4326 to draw True North arrow
-        corner_lonlat = []
-        for x, y in corner_coords:
-            corner_lonlat.append(transformer['3413_to_4326'].transform(x, y))
+        # transform 3413 to 4326 to draw True North arrow,
+        # all corners in one call
+        corner_x, corner_y = np.asarray(corner_coords).T
+        corner_lon, corner_lat = transformer['3413_to_4326'].transform(
+            corner_x, corner_y
+        )
         
         # Create a shapely Polygon and extract x/y separately
-        poly = Polygon(corner_lonlat)
+        poly = Polygon(np.column_stack([corner_lon, corner_lat]))
         inset_lon, inset_lat = poly.exterior.xy
         
         main_ax = fig.add_subplot(1, 2, 1, projection=ccrs.NorthPolarStereo())
@@ -1377,8 +1485,11 @@ def overlay_sar_drift_on_geotiff(config, gdf_lines, df_sar, base_name):
     
     # read SAR geotiff ansd set graticules
     if config['use_geotiff']:
+        # no need to warp more pixels than the saved 300 dpi figure has
+        fig_width_in, fig_height_in = fig.get_size_inches()
         masked_xr, map_extent_xr = read_geotiff_rasterio(
-            config['sar_geotiff_file']
+            config['sar_geotiff_file'],
+            target_max_dim=int(max(fig_width_in, fig_height_in) * 300)
         )
             
         # plot geotiff    
@@ -1404,20 +1515,16 @@ def overlay_sar_drift_on_geotiff(config, gdf_lines, df_sar, base_name):
         
         
     # SAR drift quivers
-    # Extract quiver vector data from LineStrings
-    lon_start = []
-    lat_start = []
-    dx = []
-    dy = []
-    
-    for line in gdf_lines:
-        if isinstance(line, LineString):
-            x0, y0 = line.coords[0]     # start point
-            x1, y1 = line.coords[-1]    # end point
-            lon_start.append(x0)
-            lat_start.append(y0)
-            dx.append(x1 - x0)
-            dy.append(y1 - y0)
+    # Extract quiver vector data from LineStrings, all at once
+    lines = np.asarray(gdf_lines, dtype=object)
+    is_line = shapely.get_type_id(lines) == shapely.GeometryType.LINESTRING
+    lines = lines[is_line]
+    start_xy = shapely.get_coordinates(shapely.get_point(lines, 0))
+    end_xy = shapely.get_coordinates(shapely.get_point(lines, -1))
+    lon_start = start_xy[:, 0]
+    lat_start = start_xy[:, 1]
+    dx = end_xy[:, 0] - lon_start
+    dy = end_xy[:, 1] - lat_start
     
     # Plot drift vectors as quivers
     stride = config['vector_stride']
@@ -1425,7 +1532,13 @@ def overlay_sar_drift_on_geotiff(config, gdf_lines, df_sar, base_name):
     Y = lat_start[::stride]
     u = dx[::stride]
     v = dy[::stride]
-    mag = np.hypot(u, v) / 1000  # magnitude in km
+    # magnitude in km; the lines come from `df_sar`, so reuse its
+    # precomputed distance when the rows line up
+    if ('total_distance_km' in df_sar
+            and len(df_sar) == len(is_line)):
+        mag = df_sar['total_distance_km'].to_numpy()[is_line][::stride]
+    else:
+        mag = np.hypot(u, v) / 1000
     Q = ax.quiver(
         X, Y, u, v, mag,
         angles='xy',
@@ -1480,121 +1593,187 @@ def overlay_sar_drift_on_geotiff(config, gdf_lines, df_sar, base_name):
     png_file = os.path.join(
         config['png_dir'], f"{base_name}.png"
     )
-    fig.savefig(png_file, bbox_inches='tight', dpi=300)
+    # fast zlib level: the PNG encode dominates the save at 300 dpi
+    fig.savefig(
+        png_file, bbox_inches='tight', dpi=300,
+        pil_kwargs={'compress_level': 1}
+    )
     plt.close(fig)
     
         
 
-def read_geotiff_rasterio(geotiff_file):
+def read_geotiff_rasterio(geotiff_file, target_max_dim=None):
     """
     Reads a GeoTIFF image using GCP-based reprojection to EPSG:3413
-    (NSIDC Sea Ice Polar Stereographic North) and returns a masked
-    array with coordinate information.
+    (NSIDC Sea Ice Polar Stereographic North) and returns a float32
+    array with background set to NaN, plus its extent.
     
     This function:
         - Opens a GeoTIFF file using rasterio
         - Extracts Ground Control Points (GCPs) to reproject the image
         to a target CRS (EPSG:3413)
         - Uses nearest-neighbor resampling to regrid the data
-        - Constructs an xarray.DataArray with spatial coordinates in meters
-        - Masks background values (zeros) to allow clean visualization
+        - Sets background values (zeros) to NaN to allow clean
+          visualization
         - Computes the image extent for use in plotting (e.g., with imshow)
     
+    Reads are fastest from tiled GeoTIFFs with internal overviews
+    (Cloud Optimized GeoTIFF layout): a decimated read via
+    `target_max_dim` can then be served from an overview instead of
+    full-resolution strips.
+    
     Parameters:
         geotiff_path (str): Path to the input GeoTIFF file containing
                             GCPs and raster data.
+        target_max_dim (int, optional): Largest output width/height in
+                            pixels that is useful to the caller. The warp
+                            output is decimated by a whole factor to fit,
+                            which lets GDAL read from overviews when the
+                            file has them. None keeps full resolution.
     
     Returns:
         tuple:
-            masked_xr (np.ma.MaskedArray): Masked 2D array of image data
-                                           with background set to NaN.
-            extent (list): [xmin, xmax, ymin, ymax] extent of the image
+            masked_xr (np.ndarray): float32 2D array of image data
+                                    with background set to NaN.
+            extent (tuple): (xmin, xmax, ymin, ymax) extent of the image
                            in meters (EPSG:3413) for use with plotting.
+    Results are cached on the file path, modification time and
+    `target_max_dim`, so re-rendering the same scene skips the warp. The
+    returned array is shared between calls and must not be modified.
+    
     Coauthor:
         Rachael Lazzaro, rachel.lazzaro@noaa.gov
     """
     
     
+    import os
+    
+    return _read_geotiff_cached(
+        geotiff_file, os.path.getmtime(geotiff_file), target_max_dim
+    )
+
+
+@functools.lru_cache(maxsize=2)
+def _read_geotiff_cached(geotiff_file, geotiff_mtime, target_max_dim):
+    """
+    Warp `geotiff_file` for `read_geotiff_rasterio`.
+    `geotiff_mtime` is only part of the cache key.
+    """
+    
+    
+    import os
     import rasterio
     from rasterio.warp import reproject, Resampling
     from rasterio.warp import calculate_default_transform
-    import xarray as xr
-    import numpy as np
+    from affine import Affine
    
 
-    with rasterio.open(geotiff_file) as src:
+    # let GDAL split the warp across all cores, and skip the directory
+    # listing GDAL otherwise does on open to find sidecar files
+    with rasterio.Env(
+            GDAL_NUM_THREADS='ALL_CPUS', GDAL_CACHEMAX=512,
+            GDAL_DISABLE_READDIR_ON_OPEN='TRUE'), \
+            rasterio.open(geotiff_file) as src:
         gcps, gcps_crs = src.get_gcps()
         dst_crs = "EPSG:3413"
         dst_transform, width, height = calculate_default_transform(
             gcps_crs, dst_crs, src.width, src.height, gcps=gcps
         )
+        
+        # coarser output grid when the full resolution cannot be shown
+        if target_max_dim:
+            factor = max(1, max(width, height) // target_max_dim)
+            if factor > 1:
+                width = max(1, width // factor)
+                height = max(1, height // factor)
+                dst_transform = dst_transform * Affine.scale(factor)
 
-        dst_array = np.empty(
-            (src.count, height, width), 
-            dtype=src.dtypes[0]
-        )
+        # only band 1 is warped, so use a single-band destination
+        # rather than one plane per band in the source; GDAL converts
+        # straight into the float32 result, so there is one allocation
+        dst_array = np.zeros((height, width), dtype=np.float32)
 
         reproject(
             source=rasterio.band(src, 1),
-            destination=dst_array[0],
+            destination=dst_array,
             src_crs=gcps_crs,
             src_transform=None, # None triggers GCP-based warping
             gcps=gcps,          # Let rasterio warp based on GCPs
             dst_transform=dst_transform,
             dst_crs=dst_crs,
-            resampling=Resampling.nearest
-        )
-        
-        # Construct xarray.DataArray with coordinates
-        x_coords = dst_transform[2] + dst_transform[0] * np.arange(width)
-        y_coords = dst_transform[5] + dst_transform[4] * np.arange(height)
-        
-        geotiff_xr = xr.DataArray(
-            dst_array[0],
-            dims=("y", "x"),
-            coords={"x": x_coords, "y": y_coords},
-            attrs={"crs": dst_crs}
+            resampling=Resampling.nearest,
+            num_threads=os.cpu_count() or 1,
+            warp_mem_limit=512
         )
-        
-        # change backround to white
-        masked_xr = np.ma.masked_equal(geotiff_xr.values, 0)
-        
-        extent = [
-            dst_transform[2],
-            dst_transform[2] + dst_transform[0] * width,
-            dst_transform[5] + dst_transform[4] * height,
-            dst_transform[5],
-        ]
-        
-        return masked_xr, extent
+        # the control points are only needed for the warp
+        del gcps
+    
+    # post-processing runs after the dataset is closed
+
+    # change backround to white: zeros become NaN, which imshow leaves
+    # blank just like a mask, in place and without a mask array
+    masked_xr = dst_array
+    np.copyto(masked_xr, np.nan, where=(masked_xr == 0))
+    
+    # cached and shared between callers, so the extent is a tuple and
+    # the array is read-only
+    extent = (
+        dst_transform[2],
+        dst_transform[2] + dst_transform[0] * width,
+        dst_transform[5] + dst_transform[4] * height,
+        dst_transform[5],
+    )
+    masked_xr.flags.writeable = False
+    
+    return masked_xr, extent
     
         
 #=============
 # Calculations
 #=============
 
+@functools.lru_cache(maxsize=1)
+def _get_geod():
+    # WGS84 geodesic solver, built once per process
+    _configure_proj()
+    from pyproj import Geod
+    
+    return Geod(ellps='WGS84')
+
+
 def compute_bearing(
-    lat1: float,  # Starting latitude(s), can be a single float or a list of floats
-    lon1: float,  # Starting longitude(s), can be a single float or a list of floats
-    lat2: float,  # Ending latitude(s), can be a single float or a list of floats
-    lon2: float   # Ending longitude(s), can be a single float or a list of floats
-) -> Tuple[float, float]:       # Returns a tuple: (fwd_azimuth, back_azimuth, distance)
+    lat1: float,  # Starting latitude(s), a single float or a numpy array
+    lon1: float,  # Starting longitude(s), a single float or a numpy array
+    lat2: float,  # Ending latitude(s), a single float or a numpy array
+    lon2: float   # Ending longitude(s), a single float or a numpy array
+) -> Tuple[float, float]:       # Returns a tuple: (fwd_azimuth, distance)
 
     """
     Calculate the daily drift between two points (start and end) based on their latitude and longitude.
 
+    Pass whole columns (e.g. `df['Lat1'].to_numpy()`) rather than calling
+    this once per vector; all pairs are then solved in a single call.
+
     :param lat1: Starting latitude(s)  
     :param lon1: Starting longitude(s)  
     :param lat2: Ending latitude(s)  
     :param lon2: Ending longitude(s)  
     :return: 
-        - fwd_azimuth (float): Forward azimuth in degrees (0 to 360), measured clockwise from true north
-        - distance (float): Great circle distance between the two points in meters
+        - fwd_azimuth (float or ndarray): Forward azimuth in degrees (-180 to 180), measured clockwise from true north
+        - distance (float or ndarray): Great circle distance between the two points in meters
     :ref: https://pyproj4.github.io/pyproj/stable/api/geod.html#pyproj.Geod.inv
     """
 
+    
     # Initialize a geodetic object using the WGS84 ellipsoid
-    geod = Geod(ellps='WGS84')
+    geod = _get_geod()
+
+    # Array inputs go to pyproj as contiguous float64 so all pairs are
+    # solved in one call without an extra copy; scalars pass through
+    lon1, lat1, lon2, lat2 = (
+        np.ascontiguousarray(v, dtype=np.float64) if np.ndim(v) else v
+        for v in (lon1, lat1, lon2, lat2)
+    )
 
     # Calculate azimuth and distance using geod.inv method
     # Note: Arguments order is (lon1, lat1, lon2, lat2) as required by pyproj.Geod.inv
@@ -1604,45 +1783,100 @@ def compute_bearing(
     return fwd_azimuth, distance 
     
     
-def compute_distance_meters(x1, y1, x2, y2, precision):
-    """
-    Compute planar bearing (clockwise from north) and Euclidean distance
-    between two points in a projected CRS (e.g., EPSG:3413).
-    
-    Parameters:
-        x1 (float): Starting longitude
-        y1 (float): Starting latitude
-        x2 (float): Ending longitude
-        y2 (float): Ending latitude
-        precision: Round significant digits
-        
-    Returns:
-        distance (float): Computed Euclidean distance
-    """
-    
-    
-    import numpy as np
-    
-    dx = x2 - x1
-    dy = y2 - y1
-
-    # Distance in kilometers --> np.hypot=(dx^2+dy^2)^.5
-    distance = np.round(np.hypot(dx, dy) / 1000, precision)
+def circular_stats(a):
+    # circular mean and standard deviation (radians) from one shared
+    # sin/cos pass over the angles
+    s = np.nanmean(np.sin(a))
+    c = np.nanmean(np.cos(a))
+    R = np.sqrt(s*s + c*c)
+    return np.arctan2(s, c), np.sqrt(-2 * np.log(np.clip(R, 1e-12, 1.0)))
 
-    return distance
-   
 
 def circular_mean(a):
-    import numpy as np
-    return np.arctan2(np.nanmean(np.sin(a)), np.nanmean(np.cos(a)))
+    return circular_stats(a)[0]
 
 
 def circular_std(a):
-    import numpy as np
-    s = np.nanmean(np.sin(a))
-    c = np.nanmean(np.cos(a))
-    R = np.sqrt(s*s + c*c)
-    return np.sqrt(-2 * np.log(np.clip(R, 1e-12, 1.0)))
+    return circular_stats(a)[1]
+
+
+def _neighbor_zscores(dist, bear, b_sin, b_cos, neigh_flat, neigh_offsets):
+    """
+    Distance and bearing z-scores of each point against its neighbors.
+    
+    Parameters:
+        dist, bear (ndarray): distance (km) and bearing (radians) per point
+        b_sin, b_cos (ndarray): sine and cosine of `bear`
+        neigh_flat (ndarray): concatenated neighbor positions, self excluded
+        neigh_offsets (ndarray): CSR offsets into `neigh_flat`, length n+1
+    
+    Returns:
+        tuple: (distance z-scores, bearing z-scores); NaN where a point
+        has no neighbors or its neighbors have zero spread
+    """
+    n_points = len(dist)
+    owner = np.repeat(np.arange(n_points), np.diff(neigh_offsets))
+    nbr = neigh_flat
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # compute neighbor mean and standard deviation
+        # (NaN neighbor values are skipped like np.nanmean)
+        neigh_dist = dist[nbr]
+        valid = ~np.isnan(neigh_dist)
+        n_dist = np.bincount(owner[valid], minlength=n_points)
+        dist_mean = np.bincount(
+            owner, weights=np.where(valid, neigh_dist, 0.0),
+            minlength=n_points
+        ) / n_dist
+        dist_std = np.sqrt(np.bincount(
+            owner,
+            weights=np.where(valid, neigh_dist - dist_mean[owner], 0.0) ** 2,
+            minlength=n_points
+        ) / n_dist)
+
+        # circular mean and standard deviation of the bearings, reduced
+        # exactly as circular_stats does: R = sqrt(s*s + c*c) of the mean
+        # sine/cosine, clipped to [1e-12, 1]. For a single neighbor or
+        # identical bearings R lands within rounding of 1, so the spread
+        # is either 0 (z-score NaN) or tiny (large z-score), the same
+        # outcome circular_stats gives for those neighbors. Do not switch
+        # to arctan2(sums) / hypot(sums) / n: hypot returns exactly 1 for
+        # those neighbors and silently changes the outlier categories
+        valid = ~np.isnan(bear[nbr])
+        n_bear = np.bincount(owner[valid], minlength=n_points)
+        sin_mean = np.bincount(
+            owner, weights=np.where(valid, b_sin[nbr], 0.0),
+            minlength=n_points
+        ) / n_bear
+        cos_mean = np.bincount(
+            owner, weights=np.where(valid, b_cos[nbr], 0.0),
+            minlength=n_points
+        ) / n_bear
+        bear_mean = np.arctan2(sin_mean, cos_mean)
+        bear_std = np.sqrt(-2 * np.log(np.clip(
+            np.sqrt(sin_mean*sin_mean + cos_mean*cos_mean), 1e-12, 1.0
+        )))
+
+        # compute z-score
+        dist_z_scores = np.where(
+            (dist_std == 0) | np.isnan(dist_std),
+            np.nan,
+            np.abs(dist - dist_mean) / dist_std
+        )
+        # normalize the radians because mean = 359° and cell = 1°
+        # subtraction gives 358°, but the real smallest difference
+        # is 2°. Use delta as a measurement of standard deviation
+        delta_bear = np.arctan2(
+            np.sin(bear - bear_mean),
+            np.cos(bear - bear_mean)
+        )
+        bear_z_scores = np.where(
+            (bear_std == 0) | np.isnan(bear_std),
+            np.nan,
+            np.abs(delta_bear) / bear_std
+        )
+    
+    return dist_z_scores, bear_z_scores
 
     
 #==================
@@ -1682,7 +1916,7 @@ def add_graticules(ax, map_extent):
     """
     
     
-    import numpy as np
+    from matplotlib.collections import LineCollection
     
     # Corners in degrees transform from EPSG:3413 to EPSG:4326
     transformer = _set_transformer()
@@ -1726,18 +1960,23 @@ def add_graticules(ax, map_extent):
     lat_max_ext = lat_max + lat_pad
     
     
+    # Project every graticule vertex in one call per direction:
+    # rows of the (n, 200) meshgrids are the individual lines
+    to_3413 = transformer['4326_to_3413']
+    lats = np.linspace(lat_min_ext, lat_max_ext, 200)
+    lons = np.linspace(lon_min_ext, lon_max_ext, 200)
+    
+    
     # Vertical lines for longitude
-    for lon in lon_labels:
-        lats = np.linspace(lat_min_ext, lat_max_ext, 200)
-        points = []
-        for lat in lats:
-            points.append(transformer['4326_to_3413'].transform(lon, lat))
-        xs, ys = zip(*points)
-        ax.plot(xs, ys, color='lightgray', linestyle='--', linewidth=0.5)
+    lon_grid, lat_grid = np.meshgrid(lon_labels, lats, indexing='ij')
+    xs, ys = to_3413.transform(lon_grid, lat_grid)
+    lon_segments = np.stack([xs, ys], axis=-1)
         
     # longitude labels
-    for lon in lon_labels:
-        x, y = transformer['3413_to_4326'].transform(lon, lat_min)
+    label_x, label_y = to_3413.transform(
+        lon_labels, np.full_like(lon_labels, lat_min, dtype=float)
+    )
+    for lon, x, y in zip(lon_labels, label_x, label_y):
         ax.text(
             x + 30000,
             y + 5000,
@@ -1749,17 +1988,22 @@ def add_graticules(ax, map_extent):
 
 
     # horizontal lines for latitude    
-    for lat in lat_labels:
-        lons = np.linspace(lon_min_ext, lon_max_ext, 200)
-        points = []
-        for lon in lons:
-            points.append(transformer['4326_to_34123'].transform(lon, lat))
-        xs, ys = zip(*points)
-        ax.plot(xs, ys, color='lightgray', linestyle='--', linewidth=0.5)    
+    lon_grid, lat_grid = np.meshgrid(lons, lat_labels, indexing='xy')
+    xs, ys = to_3413.transform(lon_grid, lat_grid)
+    lat_segments = np.stack([xs, ys], axis=-1)
+    
+    # draw every graticule as one artist from the (n_lines, 200, 2)
+    # vertex arrays
+    ax.add_collection(LineCollection(
+        np.concatenate([lon_segments, lat_segments]),
+        colors='lightgray', linestyles='--', linewidths=0.5
+    ))
     
     # Label latitudes at right
-    for lat in lat_labels:
-        x, y = transformer['4326_to_3413'].transform(lon_labels[-1], lat)
+    label_x, label_y = to_3413.transform(
+        np.full_like(lat_labels, lon_labels[-1], dtype=float), lat_labels
+    )
+    for lat, x, y in zip(lat_labels, label_x, label_y):
         ax.text(
             x - 5000,
             y - 10000,
@@ -1854,20 +2098,22 @@ def add_true_north(ax, xmin, xmax, ymin, ymax):
     
     
     transformer = _set_transformer()
+    to_lonlat = transformer['3413_to_4326']
+    to_3413 = transformer['4326_to_3413']
     
     # bottom-right corner of the plot as reference point
     x_ref = xmax - 0.05 * (xmax - xmin)
     y_ref = ymin + 0.05 * (ymax - ymin)
     
     # convert meters to degrees
-    lon_ref, lat_ref = transformer['3413_to_4326'].transform(x_ref, y_ref)
+    lon_ref, lat_ref = to_lonlat.transform(x_ref, y_ref)
     
     # move a small distance north
     lat_north = lat_ref + 0.5
     lon_north = lon_ref
     
     # convert degrees back to meters
-    x_north, y_north = transformer['4326_to_3413'].transform(lon_north, lat_north)
+    x_north, y_north = to_3413.transform(lon_north, lat_north)
     
     # arrow
     ax.annotate(
@@ -1886,18 +2132,204 @@ def add_true_north(ax, xmin, xmax, ymin, ymax):
 #  Outlier detection
 #===================
 
+def _init_plot_worker():
+    # worker processes only write files; never open a GUI backend.
+    # Pay the matplotlib/cartopy imports and the basemap projection once
+    # per worker at startup rather than inside the first scene
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot  # noqa: F401
+    _get_polar_basemap("10m")
+
+
+def _process_outlier_scene(gfilter_path, config, outlier_type='sd'):
+    """
+    Detect outliers for one gfilter file, write its geopackage and
+    per-scene inlier/outlier PNG.
+    
+    Returns:
+        tuple: (quiver payload or None if the file was skipped,
+        scene start time, scene end time)
+    """
+    import matplotlib.pyplot as plt
+    import cartopy.feature as cfeature
+    
+    # projection and basemap shared by every figure in this process
+    crs_3413, land_geoms, coast_geoms = _get_polar_basemap("10m")
+    
+    
+    t1, t2 = _parse_pair_times(gfilter_path)
+    start, end = min(t1, t2), max(t1, t2)
+    
+
+    df = read_sar_drift_data_file(
+        input_file=gfilter_path,
+        config=config
+    )
+    
+    if df.shape[0] < config['ignore_vector_threshold']:
+        # ignore files with few observations
+        # print(f"skipping {os.path.basename(gfilter_path)} with {df.shape[0]} observations")
+        return None, start, end
+    
+    
+    
+    # skip 75km file if MaxCorr2 > MaxCorr1 for < 60% of the data
+    # if '_0075000m_' in gfilter_path:
+    # if gfilter_path == gfilter_path: # always run
+    #     pct_correct = (df['Maxcorr2'] > df['Maxcorr1']).mean() * 100
+    #     if pct_correct < 60:
+    #         # print(
+    #         #     f"Reject file: {os.path.basename(gfilter_path)}\n"
+    #         #     f"pct_correct={pct_correct:.1f}% (<60%)"
+    #         # )
+    #         continue
+            
+
+    # define outliers
+    outlier_df, quiver_payloads_by_iter = outlier_search(
+        df=df,
+        config=config,
+        radius_km=25,
+        min_neighbors=8,
+        outlier_type=outlier_type,
+        iter_count = 2
+    )
+    
+    # save intermediary outlier file
+    basename=os.path.basename(gfilter_path)
+    
+    # create geopackage file
+    verbose = config['verbose']
+    config['verbose'] = False
+    gdf_points, gdf_lines = create_shape_package(
+            df=outlier_df,
+            base_name=basename,
+            config=config
+    )
+    config['verbose'] = verbose
+    
+    
+    
+    # draw inlier quivers on supplied PNG file
+    # Plot SAR drift vectors
+
+
+    # Note: Cartopy's NorthPolarStereo aligns with EPSG:3413 for most use cases,
+    # but EPSG:3413 has specific parameters. If you need exact EPSG:3413,
+    # we can define it via PROJ string; usually this is fine for coastlines.
+
+    fig = plt.figure(figsize=(10, 10))
+    ax = plt.axes(projection=crs_3413)
+
+    # Set extent in the projection's coordinate system (meters)
+    pad = 100_000 # 10km
+    xmin = np.round(outlier_df["X1"].min() - pad, 3)
+    xmax = np.round(outlier_df["X1"].max() + pad, 3)
+    ymin = np.round(outlier_df["Y1"].min() - pad, 3)
+    ymax = np.round(outlier_df["Y1"].max() + pad, 3)
+    
+    map_width = xmax - xmin
+    map_height = ymax - ymin
+    map_span = np.round(max(map_height, map_width), 0)
+    if map_span > 2_000_000:
+        quiver_scale = config['quiver_scale_large_area']
+    else:
+        quiver_scale = config['quiver_scale_small_area']
+
+    ax.set_extent([xmin, xmax, ymin, ymax], crs=crs_3413)
+
+    # Coastlines / land
+    ax.add_geometries(
+        land_geoms, crs=crs_3413,
+        facecolor=cfeature.COLORS['land'], edgecolor="face", zorder=0
+    )
+    ax.add_geometries(
+        coast_geoms, crs=crs_3413,
+        facecolor="none", edgecolor="black", linewidth=1.0, zorder=1
+    )
+
+    X = outlier_df["X1"].to_numpy()
+    Y = outlier_df["Y1"].to_numpy()
+    u = outlier_df["dx"].to_numpy()
+    v = outlier_df["dy"].to_numpy()
+    mask_inlier = outlier_df["outlier_category"].isin(["00", "01"]).to_numpy()
+    
+    inlier_X, outlier_X = X[mask_inlier], X[~mask_inlier]
+    inlier_Y, outlier_Y = Y[mask_inlier], Y[~mask_inlier]
+    inlier_u, outlier_u = u[mask_inlier], u[~mask_inlier]
+    inlier_v, outlier_v = v[mask_inlier], v[~mask_inlier]
+    
+    # mosaic-only copy, already thinned to the mosaic stride; float32 is
+    # plenty for plotting and halves what the worker pickles back to the
+    # parent. The magnitude range still covers every vector so the
+    # mosaic colour scale is unchanged
+    step = config['inlier_vector_stride']
+    M = np.hypot(u, v).astype(np.float32) / 1000 # km
+    payload = {
+        "X": X[::step].astype(np.float32),
+        "Y": Y[::step].astype(np.float32),
+        "u": u[::step].astype(np.float32),
+        "v": v[::step].astype(np.float32),
+        "M": M[::step],
+        "M_min": np.nanmin(M) if M.size else np.nan,
+        "M_max": np.nanmax(M) if M.size else np.nan
+    }
+    
+    ax.quiver(
+        inlier_X, inlier_Y, inlier_u, inlier_v,
+        transform=crs_3413,
+        angles="xy", scale_units="xy",
+        scale=quiver_scale,
+        width=0.002, pivot="tail",
+        color="green", zorder=2, label="inliers",
+        rasterized=True
+    )
+
+    ax.quiver(
+        outlier_X, outlier_Y, outlier_u, outlier_v,
+        transform=crs_3413,
+        angles="xy", scale_units="xy",
+        scale=quiver_scale,
+        width=0.002, pivot="tail",
+        color="red", zorder=2, label="outliers",
+        rasterized=True
+    )
+    
+    
+    ax.set_title(
+        f"Scene: {os.path.basename(gfilter_path)}\n"
+        f"X {xmin} to {xmax}; Y {ymin} to {ymax}\n"
+        f"Total observations: {outlier_df.shape[0]}"
+    )
+    
+    ax.legend(loc="lower right")
+    
+    out_png_path = os.path.join(
+        config['output_dir'],
+        f'{basename}_inliers.png'
+    )
+    # preview resolution; layout fixed once instead of a tight-bbox
+    # measuring pass at save time
+    fig.tight_layout()
+    plt.savefig(
+        out_png_path, dpi=100,
+        pil_kwargs={'compress_level': 1}
+    )
+    plt.close(fig)
+    
+    return payload, start, end
+
+
 def detect_outliers(config, outlier_type='sd'):
     import matplotlib.pyplot as plt
     import matplotlib.colors as mcolors
     import cartopy.crs as ccrs
-    import cartopy.feature as cfeature
-    import numpy as np
     import xarray as xr
-
-    import pandas as pd
+    import netCDF4
     from glob import glob
     from tqdm import tqdm
-    import itertools
+    from concurrent.futures import ProcessPoolExecutor
     
     # if outlier_type not in ['sd', 'md']:
     #     print(f"Undefined outlier type: {outlier_type}")
@@ -1924,193 +2356,90 @@ def detect_outliers(config, outlier_type='sd'):
         gfilter_pattern = os.path.join(sar_drift_dir, gfilter_mask)
         gfilter_matches = sorted(glob(gfilter_pattern))
     else:
+        sar_drift_dir = os.path.dirname(config['sar_drift_file_name'])
         gfilter_matches = [config['sar_drift_file_name']]
-        
-    
     
-
-    for gfilter_path in tqdm(
-            gfilter_matches,
-            '    Creating outlier geopackages'
-        ):
-        
-        # use 0075000m file instead of 0050000m
-        # (always force txt extension)
+    # use 0075000m file instead of 0050000m
+    # (always force txt extension); one directory listing instead of a
+    # stat per file
+    txt_files = set(glob(os.path.join(sar_drift_dir, "*.txt")))
+    for i, gfilter_path in enumerate(gfilter_matches):
         gfilter_path_75km = gfilter_path.replace(
             '_0050000m_',
             '_0075000m_',
         )
-        
         gfilter_path_75km = f'{os.path.splitext(gfilter_path_75km)[0]}.txt'
-        if os.path.exists(gfilter_path_75km):
-            gfilter_path = gfilter_path_75km
-    
-    
-        t1, t2 = _parse_pair_times(gfilter_path)
-        starts.append(min(t1, t2))
-        ends.append(max(t1, t2))
-        
-
-        df = read_sar_drift_data_file(
-            input_file=gfilter_path,
-            config=config
-        )
-        
-        if df.shape[0] < config['ignore_vector_threshold']:
-            # ignore files with few observations
-            # print(f"skipping {os.path.basename(gfilter_path)} with {df.shape[0]} observations")
-            continue
-        
-        
-        
-        # skip 75km file if MaxCorr2 > MaxCorr1 for < 60% of the data
-        # if '_0075000m_' in gfilter_path:
-        # if gfilter_path == gfilter_path: # always run
-        #     pct_correct = (df['Maxcorr2'] > df['Maxcorr1']).mean() * 100
-        #     if pct_correct < 60:
-        #         # print(
-        #         #     f"Reject file: {os.path.basename(gfilter_path)}\n"
-        #         #     f"pct_correct={pct_correct:.1f}% (<60%)"
-        #         # )
-        #         continue
-                
-
-        # define outliers
-        outlier_df, quiver_payloads_by_iter = outlier_search(
-            df=df,
-            config=config,
-            radius_km=25,
-            min_neighbors=8,
-            outlier_type=outlier_type,
-            iter_count = 2
-        )
-        
-        # save intermediary outlier file
-        basename=os.path.basename(gfilter_path)
-        
-        # create geopackage file
-        verbose = config['verbose']
-        config['verbose'] = False
-        gdf_points, gdf_lines = create_shape_package(
-                df=outlier_df,
-                base_name=basename,
-                config=config
-        )
-        config['verbose'] = verbose
-        
-        
-        
-        # draw inlier quivers on supplied PNG file
-        # Plot SAR drift vectors
-
-    
-        crs_3413 = ccrs.NorthPolarStereo(central_longitude=-45)
-        # Note: Cartopy's NorthPolarStereo aligns with EPSG:3413 for most use cases,
-        # but EPSG:3413 has specific parameters. If you need exact EPSG:3413,
-        # we can define it via PROJ string; usually this is fine for coastlines.
-    
-        fig = plt.figure(figsize=(10, 10))
-        ax = plt.axes(projection=crs_3413)
-    
-        # Set extent in the projection's coordinate system (meters)
-        pad = 100_000 # 10km
-        xmin = np.round(outlier_df["X1"].min() - pad, 3)
-        xmax = np.round(outlier_df["X1"].max() + pad, 3)
-        ymin = np.round(outlier_df["Y1"].min() - pad, 3)
-        ymax = np.round(outlier_df["Y1"].max() + pad, 3)
-        
-        map_width = xmax - xmin
-        map_height = ymax - ymin
-        map_span = np.round(max(map_height, map_width), 0)
-        if map_span > 2_000_000:
-            quiver_scale = config['quiver_scale_large_area']
-        else:
-            quiver_scale = config['quiver_scale_small_area']
-
-        ax.set_extent([xmin, xmax, ymin, ymax], crs=crs_3413)
-    
-        # Coastlines / land
-        ax.add_feature(cfeature.LAND, zorder=0)
-        ax.coastlines(resolution="10m", linewidth=1.0, zorder=1)
-    
-        mask_inlier = outlier_df["outlier_category"].isin(["00", "01"])
-        
-        inlier_X = outlier_df.loc[mask_inlier, "X1"].to_numpy()
-        inlier_Y = outlier_df.loc[mask_inlier, "Y1"].to_numpy()
-        inlier_u = outlier_df.loc[mask_inlier, "dx"].to_numpy()
-        inlier_v = outlier_df.loc[mask_inlier, "dy"].to_numpy()
-
-        outlier_X = outlier_df.loc[~mask_inlier, "X1"].to_numpy()
-        outlier_Y = outlier_df.loc[~mask_inlier, "Y1"].to_numpy()
-        outlier_u = outlier_df.loc[~mask_inlier, "dx"].to_numpy()
-        outlier_v = outlier_df.loc[~mask_inlier, "dy"].to_numpy()
-        
-        quiver_payloads.append({
-            "X": outlier_df["X1"].to_numpy(),
-            "Y": outlier_df["Y1"].to_numpy(),
-            "u": outlier_df["dx"].to_numpy(),
-            "v": outlier_df["dy"].to_numpy()
-        })
-        
-        ax.quiver(
-            inlier_X, inlier_Y, inlier_u, inlier_v,
-            transform=crs_3413,
-            angles="xy", scale_units="xy",
-            scale=quiver_scale,
-            width=0.002, pivot="tail",
-            color="green", zorder=2, label="inliers"
-        )
-
-        ax.quiver(
-            outlier_X, outlier_Y, outlier_u, outlier_v,
-            transform=crs_3413,
-            angles="xy", scale_units="xy",
-            scale=quiver_scale,
-            width=0.002, pivot="tail",
-            color="red", zorder=2, label="outliers"
-        )
-        
-        
-        ax.set_title(
-            f"Scene: {os.path.basename(gfilter_path)}\n"
-            f"X {xmin} to {xmax}; Y {ymin} to {ymax}\n"
-            f"Total observations: {outlier_df.shape[0]}"
-        )
-        
-        ax.legend(loc="lower right")
-        
-        out_png_path = os.path.join(
-            config['output_dir'],
-            f'{basename}_inliers.png'
-        )
-        plt.savefig(out_png_path, dpi=150, bbox_inches="tight")
-        plt.close(fig)
+        if gfilter_path_75km in txt_files:
+            gfilter_matches[i] = gfilter_path_75km
+        
+    
+    
+    # projection and basemap for the mosaic
+    crs_3413, land_geoms, coast_geoms = _get_polar_basemap("10m")
+    
+    # scenes are independent, so fan them out over worker processes
+    # (Windows caps a process pool at 61 workers)
+    max_workers = min(len(gfilter_matches), os.cpu_count() or 1, 61)
+    with ProcessPoolExecutor(
+            max_workers=max(max_workers, 1),
+            initializer=_init_plot_worker
+        ) as executor:
+        results = list(tqdm(
+            executor.map(
+                functools.partial(
+                    _process_outlier_scene,
+                    config=config,
+                    outlier_type=outlier_type
+                ),
+                gfilter_matches
+            ),
+            total=len(gfilter_matches),
+            desc='    Creating outlier geopackages'
+        ))
+    
+    for payload, start, end in results:
+        starts.append(start)
+        ends.append(end)
+        if payload is not None:
+            quiver_payloads.append(payload)
 
 
     # full plot
     
     # get sea ice extent from GMASI
     nc_path = r"D:\NOAA\Analysis\GMASI\GMASI-Snowice-2km_v1r0_blend_s202510150000000_e202510152359599_c202510160223347.nc"
-    ds = xr.open_dataset(nc_path)
-    ds = ds.sortby("Latitude")
-    arctic_ds = ds["SnowIceMap"].sel(Latitude=slice(60, 90))
-    # stride = 1
-    # ice_ds = ice.isel(
-    #     Latitude=slice(None, None, stride),
-    #     Longitude=slice(None, None, stride),
-    # )
-    ice_mask = xr.where(arctic_ds == 3, 1.0, np.nan)
+    # lazy, chunked open of just the ice map and its coordinates (the
+    # variable list comes from a header-only read); flipping a descending
+    # latitude axis is a view, so only the arctic subset below is ever
+    # read from disk
+    keep_vars = ("SnowIceMap", "Latitude", "Longitude")
+    with netCDF4.Dataset(nc_path) as nc:
+        drop_vars = [v for v in nc.variables if v not in keep_vars]
+    ds = xr.open_dataset(
+        nc_path, engine="netcdf4", drop_variables=drop_vars,
+        chunks={"Latitude": 2048, "Longitude": 2048}
+    )
+    arctic_ds = _ensure_increasing_1d_coord(ds["SnowIceMap"], "Latitude")
+    arctic_ds = arctic_ds.sel(Latitude=slice(60, 90))
+    # thin the 2 km grid to about one cell per output pixel of the
+    # 12 in / 150 dpi mosaic: 60-90N spans the map radius and the 60N
+    # circle is about pi map widths long
+    map_px = 12 * 150
+    lat_stride = max(1, arctic_ds.sizes["Latitude"] // (map_px // 2))
+    lon_stride = max(1, int(arctic_ds.sizes["Longitude"] // (np.pi * map_px)))
+    arctic_ds = arctic_ds.isel(
+        Latitude=slice(None, None, lat_stride),
+        Longitude=slice(None, None, lon_stride),
+    )
+    ice_mask = xr.where(arctic_ds == 3, 1.0, np.nan).compute()
     lats = ice_mask["Latitude"].to_numpy()
     lons = ice_mask["Longitude"].to_numpy()
-    lons_2d, lats_2d = np.meshgrid(lons, lats)
     
     
     # transformer = _set_transformer()
     # lons_X, lats_Y = transformer['4326_3413'].transform(lons_2d, lats_2d)
     
     
-    crs_3413 = ccrs.NorthPolarStereo(central_longitude=-45)
-    
     # compute global extent from all X/Y points
     # all_x = np.concatenate([p["X"] for p in quiver_payloads if len(p["X"])])
     # all_y = np.concatenate([p["Y"] for p in quiver_payloads if len(p["Y"])])
@@ -2118,14 +2447,9 @@ def detect_outliers(config, outlier_type='sd'):
     # pad_m = 50_000  # 50 km padding
     # xmin, xmax = all_x.min() - pad_m, all_x.max() + pad_m
     # ymin, ymax = all_y.min() - pad_m, all_y.max() + pad_m
-    all_mag = np.concatenate([
-        np.hypot(p["u"], p["v"])/1000 for p in quiver_payloads if len(p["u"])
-    ])
-
-    
     norm = mcolors.Normalize(
-        vmin=np.nanmin(all_mag),
-        vmax=np.nanmax(all_mag)
+        vmin=np.nanmin([p["M_min"] for p in quiver_payloads]),
+        vmax=np.nanmax([p["M_max"] for p in quiver_payloads])
     )
     
     fig = plt.figure(figsize=(12, 12))
@@ -2133,14 +2457,20 @@ def detect_outliers(config, outlier_type='sd'):
     # ax.set_extent([xmin, xmax, ymin, ymax], crs=crs_3413)
     ax.set_extent([-180, 180, 60, 90], crs=ccrs.PlateCarree())
     
-    ax.add_feature(cfeature.LAND, facecolor="#efe8d8", zorder=0)
-    ax.coastlines(resolution="10m", linewidth=1.0, zorder=2)
+    ax.add_geometries(
+        land_geoms, crs=crs_3413,
+        facecolor="#efe8d8", edgecolor="face", zorder=0
+    )
+    ax.add_geometries(
+        coast_geoms, crs=crs_3413,
+        facecolor="none", edgecolor="black", linewidth=1.0, zorder=2
+    )
     # ax.set_facecolor("#cfe8f3") # ocean blue
     ax.set_facecolor("#bfe3f3")
     # sea ice
     ice_cmap = mcolors.ListedColormap(["#f7f7f7"]) # sea ice as off-white
     ax.pcolormesh(
-        lons_2d, lats_2d, ice_mask.to_numpy(),
+        lons, lats, ice_mask.to_numpy(), # rectilinear: 1D coords suffice
         transform=ccrs.PlateCarree(),
         cmap=ice_cmap,
         shading="nearest",
@@ -2159,10 +2489,10 @@ def detect_outliers(config, outlier_type='sd'):
         if len(p["X"]) == 0:
             continue
         
-        step = config['inlier_vector_stride']
-        X = p["X"][::step]; Y = p["Y"][::step]
-        u = p["u"][::step]; v = p["v"][::step]
-        M = np.hypot(u, v)/1000 # km
+        # payloads arrive already strided
+        X = p["X"]; Y = p["Y"]
+        u = p["u"]; v = p["v"]
+        M = p["M"] # km
     
         q = ax.quiver(
             X, Y, u, v, M,   # <-- M colors the arrows
@@ -2212,7 +2542,10 @@ def detect_outliers(config, outlier_type='sd'):
     leg.get_frame().set_linewidth(1.0)
     
     out_png_path = os.path.join(config["output_dir"], "all_inliers.png")
-    plt.savefig(out_png_path, dpi=150, bbox_inches="tight")
+    plt.savefig(
+        out_png_path, dpi=150, bbox_inches="tight",
+        pil_kwargs={'compress_level': 1}
+    )
     plt.close(fig)
     
     
@@ -2314,7 +2647,6 @@ def detect_outliers(config, outlier_type='sd'):
     
 def outlier_search(df, config, outlier_type,
                    radius_km=20, min_neighbors=10, iter_count=1):
-    import numpy as np
     from scipy.spatial import cKDTree
     # from sklearn.covariance import MinCovDet
     # from scipy.stats import chi2
@@ -2331,36 +2663,53 @@ def outlier_search(df, config, outlier_type,
     out_df = out_df.sort_values(by=['File1', 'File2'], ascending=True)
     out_df = out_df.reset_index(drop=True) # reset index after sorting
     out_df["bearing_rad"] = np.deg2rad(out_df["Bear_deg"].to_numpy())
-    out_df["b_sin"] = np.sin(out_df["bearing_rad"])
-    out_df["b_cos"] = np.cos(out_df["bearing_rad"])
     out_df["outlier_category"] = '01' # default value of significant inlier
     out_df["neighbor_indices"] = None
     out_df["neighbor_count"] = 0
     out_df["distance_z_score"] = np.nan
     out_df["bearing_z_score"] = np.nan
     
+    # raw arrays for the neighbor statistics (positions == out_df labels)
+    xy_all = out_df[["X1", "Y1"]].to_numpy(np.float64)
+    dx_all = out_df["dx"].to_numpy()
+    dy_all = out_df["dy"].to_numpy()
+    dist_all = out_df["total_distance_km"].to_numpy(np.float64)
+    bear_all = out_df["bearing_rad"].to_numpy(np.float64)
+    sin_all = np.sin(bear_all)
+    cos_all = np.cos(bear_all)
+    
     out_df["scene"] = out_df.groupby(
         ['File1', 'File2'],
         sort=False
     ).ngroup() + 1
-    out_df.to_csv(os.path.join(config['output_dir'], 'grouped.csv'))
+    scene_all = out_df["scene"].to_numpy()
+    if config['verbose']:
+        # debug dump of the scene grouping (overwritten for each file)
+        out_df.to_csv(os.path.join(config['output_dir'], 'grouped.csv'))
+    
+    # per-point results; points outside the inlier pool keep the values
+    # from the iteration that flagged them. Categories are tracked as
+    # base * 10 + confidence codes and only exported as strings at the end
+    n_points = len(out_df)
+    cat_code = np.full(n_points, 1, dtype=np.int8)
+    dist_z = np.full(n_points, np.nan)
+    bear_z = np.full(n_points, np.nan)
+    neigh_counts = np.zeros(n_points, dtype=np.int32)
+    neigh_lists = np.full(n_points, None, dtype=object)
     
     
-
-
-    
     for iter_idx in range(iter_count):
         # iteratively run outlier detection until no new outliers found
-        # instantiate pool data frame
-        pool_df = out_df[out_df['outlier_category'].isin(['00', '01'])].copy() # keep any inliet whether confident or not
-        inlier_count = (out_df['outlier_category'] == '01').sum()
+        # pool of inliers whether confident or not (codes 00 and 01)
+        pool_idx = np.flatnonzero(cat_code <= 1)
+        inlier_count = np.count_nonzero(cat_code == 1)
         
         
         quiver_payloads_by_iter.append({
-            "X": pool_df["X1"].to_numpy(),
-            "Y": pool_df["Y1"].to_numpy(),
-            "u": pool_df["dx"].to_numpy(),
-            "v": pool_df["dy"].to_numpy()
+            "X": xy_all[pool_idx, 0],
+            "Y": xy_all[pool_idx, 1],
+            "u": dx_all[pool_idx],
+            "v": dy_all[pool_idx]
         })
         
         # stop if stable
@@ -2371,81 +2720,51 @@ def outlier_search(df, config, outlier_type,
 
         
         # create neighbors for each scene            
-        for scene_id, scene_df in pool_df.groupby("scene", sort=False):
-            xy = scene_df[["X1", "Y1"]].to_numpy()
+        pool_scene = scene_all[pool_idx]
+        scene_order = np.argsort(pool_scene, kind="stable")
+        pool_idx = pool_idx[scene_order]
+        scene_bounds = np.flatnonzero(np.diff(pool_scene[scene_order])) + 1
+        for scene_index in np.split(pool_idx, scene_bounds):
+            xy = xy_all[scene_index]
             if len(xy) == 0:
                 continue
             
             tree = cKDTree(xy)
-            all_neighbors = tree.query_ball_point(xy, r=radius_m)
+            # every unordered pair within the radius once (self excluded),
+            # mirrored into sorted (owner, neighbor) pairs
+            pairs = tree.query_pairs(r=radius_m, output_type='ndarray')
             # Xall = scene_df[['U_kmdy', 'V_kmdy', 'b_sin', 'b_cos']].to_numpy() # just bearing rads (not sin & cos)
             # scene_df.to_csv(fr'D:\NOAA\GitHub\buoy_eda\output\scenes\{scene_df["File1"].iloc[0]}___{scene_df["File2"].iloc[0]}.csv')
             
-            for local_idx, local_neighbors in enumerate(all_neighbors):
-                
-                # drop self
-                neigh_idxs = [
-                    j for j in local_neighbors if j != local_idx
-                ]
-                
-                target_out_idx = scene_df.index[local_idx]
-                
-                if len(neigh_idxs) == 0:
-                    out_df.at[target_out_idx, "neighbor_indices"] = None
-                    out_df.at[target_out_idx, "neighbor_count"] = 0
-                    out_df.at[target_out_idx, "distance_z_score"] = np.nan
-                    out_df.at[target_out_idx, "bearing_z_score"] = np.nan
-                    continue
-                
-                neigh_rows = scene_df.iloc[neigh_idxs]
-
-                neigh_dist = neigh_rows['total_distance_km'].to_numpy()
-                neigh_bear = neigh_rows['bearing_rad'].to_numpy()
-                
-                # compute neighbor mean and standard deviation
-                dist_mean = np.nanmean(neigh_dist)
-                dist_std = np.nanstd(neigh_dist)
-                bear_mean = circular_mean(neigh_bear)
-                bear_std = circular_std(neigh_bear)
-                
-                # get current cell values
-                cell_dist = scene_df.iloc[local_idx]["total_distance_km"]
-                cell_bear = scene_df.iloc[local_idx]["bearing_rad"]
-                
-                # compute z-score
-                if (dist_std == 0) or np.isnan(dist_std):
-                    dist_z_score = np.nan
-                else:   
-                    dist_z_score = (np.abs(cell_dist - dist_mean)/dist_std)
-                # dist_z_scores.append(dist_z_score)
-                # normalize the radians because mean = 359° and cell = 1°
-                # subtraction gives 358°, but the real smallest difference
-                # is 2°. Use delta as a measurement of standard deviation
-                delta_bear = np.arctan2(
-                    np.sin(cell_bear - bear_mean),
-                    np.cos(cell_bear - bear_mean)
+            n_scene = len(xy)
+            owner = np.concatenate((pairs[:, 0], pairs[:, 1]))
+            nbr = np.concatenate((pairs[:, 1], pairs[:, 0]))
+            pair_order = np.lexsort((nbr, owner))
+            owner = owner[pair_order]
+            nbr = nbr[pair_order]
+            neigh_count = np.bincount(owner, minlength=n_scene)
+            
+            neigh_offsets = np.concatenate(([0], np.cumsum(neigh_count)))
+            dist_z_scores, bear_z_scores = _neighbor_zscores(
+                dist_all[scene_index], bear_all[scene_index],
+                sin_all[scene_index], cos_all[scene_index],
+                nbr, neigh_offsets
+            )
+            
+            # store neighbors as out_df indices
+            neigh_out_idxs = np.split(scene_index[nbr], neigh_offsets[1:-1])
+            
+            # out_df has a RangeIndex, so labels are positions
+            dist_z[scene_index] = np.round(dist_z_scores, 3)
+            bear_z[scene_index] = np.round(bear_z_scores, 3)
+            neigh_counts[scene_index] = neigh_count
+            for target_out_idx, neigh_out_idx in zip(scene_index,
+                                                     neigh_out_idxs):
+                neigh_lists[target_out_idx] = (
+                    neigh_out_idx.tolist() if neigh_out_idx.size else None
                 )
-                if (bear_std == 0) or np.isnan(bear_std):
-                    bear_z_score = np.nan
-                else:
-                    bear_z_score = np.abs(delta_bear) / bear_std
-
-                
-                # store neighbors as out_df indices
-                neigh_out_idx = [
-                    int(scene_df.index[j]) for j in neigh_idxs
-                ]
-                neigh_out_idx = [
-                    i for i in neigh_out_idx if i != target_out_idx
-                ]
-    
-                
-                out_df.at[target_out_idx, "neighbor_indices"] = neigh_out_idx
-                out_df.at[target_out_idx, "neighbor_count"] = len(neigh_out_idx)
-                out_df.at[target_out_idx, "distance_z_score"] = np.round(dist_z_score, 3)
-                out_df.at[target_out_idx, "bearing_z_score"] = np.round(bear_z_score, 3)
-                
-                
+            
+            
                 # # Mahalanobis distance
                 # if outlier_type=='md':
                 #     x = Xall[idx, :] # target vector
@@ -2493,28 +2812,20 @@ def outlier_search(df, config, outlier_type,
         30: Distance and bearing (under neighbor threshold)
         31: Distance and bearing (equal to or above neighbor threshold)
         """
-        distance_filter = out_df['distance_z_score'] > 3
-        bearing_filter = out_df['bearing_z_score'] > 3
-        base_cat = np.select(
-            [
-                distance_filter & ~bearing_filter,
-                ~distance_filter & bearing_filter,
-                distance_filter & bearing_filter, 
-            ],
-            [1, 2, 3],
-            default=0
-        ).astype(np.int8)
-        statistical_confidence_flag = (
-            out_df["neighbor_count"] >= min_neighbors
-        ).astype(np.int8) # force 0/1 not True/False
-        out_df["outlier_category"] = (
-            base_cat.astype(str) + statistical_confidence_flag.astype(str)
-        )
+        base_cat = (dist_z > 3).astype(np.int8) + 2 * (bear_z > 3)
+        statistical_confidence_flag = neigh_counts >= min_neighbors
+        cat_code = (base_cat * 10 + statistical_confidence_flag).astype(np.int8)
                     
 
         # review_columns = ['outlier_category', 'neighbor_indices', 'neighbor_count', 'distance_z_score', 'bearing_z_score']
         # out_df[review_columns].to_csv(fr'D:\NOAA\GitHub\buoy_eda\output\iterations\{iter_idx+1}.csv')                    
     
+    out_df["distance_z_score"] = dist_z
+    out_df["bearing_z_score"] = bear_z
+    out_df["neighbor_count"] = neigh_counts
+    out_df["neighbor_indices"] = neigh_lists
+    # QGIS styles match on the two-character category strings
+    out_df["outlier_category"] = _OUTLIER_CATEGORY_LABELS[cat_code]
    
     return out_df, quiver_payloads_by_iter    
 